@@ -7,6 +7,9 @@ def create_app():
     app.config.from_mapping(
         SECRET_KEY='dev',
         DATABASE=app.instance_path + '/fantasy_baseball.sqlite',
+        # Solve every lineup type (hitting, pitching and "both") with PuLP/CBC instead of
+        # the in-process SciPy solvers
+        USE_PULP_SOLVER=False,
     )
     
     # Set custom JSON encoder to handle NumPy types
@@ -4,10 +4,15 @@ import numpy as np
 import os
 import tempfile
 import json
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from werkzeug.utils import secure_filename
-from app.database.db import get_db
-from app.models.analysis import analyze_data, calculate_what_if
+from app.database.db import get_db, query_dicts
+from app.models.analysis import analyze_data, calculate_what_if, load_what_if_arrays
 import pulp
+from scipy import sparse
+from scipy.optimize import milp, linear_sum_assignment, LinearConstraint, Bounds
 
 bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -186,6 +191,9 @@ def delete_model(model_id):
         db.execute('DELETE FROM models WHERE id = ?', (model_id,))
         db.commit()
         
+        # Cached what-if data for the deleted model is now out of date
+        load_what_if_arrays.cache_clear()
+        
         return jsonify({'success': True})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -291,14 +299,8 @@ def get_standings():
         # Convert to list of dictionaries and ensure numeric values are Python native types
         result = []
         for standing in standings:
-            standing_dict = dict(standing)
-            # Convert numeric fields to appropriate Python types
-            for key in ['R', 'HR', 'RBI', 'SB', 'W', 'K', 'SVH']:
-                if key in standing_dict and standing_dict[key] is not None:
-                    standing_dict[key] = int(standing_dict[key])
-            for key in ['AVG', 'ERA', 'WHIP']:
-                if key in standing_dict and standing_dict[key] is not None:
-                    standing_dict[key] = float(standing_dict[key])
+            # Convert to a dictionary with numeric fields as Python native types
+            standing_dict = typed_dict(standing, STANDING_INT_KEYS, STANDING_FLOAT_KEYS)
             result.append(standing_dict)
         
         return jsonify({
@@ -322,14 +324,7 @@ def get_standing(model_id):
             return jsonify({'error': f'No standing found with ModelId {model_id}'}), 404
         
         # Convert to dictionary and ensure numeric values are Python native types
-        standing_dict = dict(standing)
-        # Convert numeric fields to appropriate Python types
-        for key in ['R', 'HR', 'RBI', 'SB', 'W', 'K', 'SVH']:
-            if key in standing_dict and standing_dict[key] is not None:
-                standing_dict[key] = int(standing_dict[key])
-        for key in ['AVG', 'ERA', 'WHIP']:
-            if key in standing_dict and standing_dict[key] is not None:
-                standing_dict[key] = float(standing_dict[key])
+        standing_dict = typed_dict(standing, STANDING_INT_KEYS, STANDING_FLOAT_KEYS)
         
         return jsonify(standing_dict)
     except Exception as e:
@@ -412,14 +407,8 @@ def get_team_roster(team_id):
         
         hitters_list = []
         for hitter in hitters:
-            hitter_dict = dict(hitter)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB']:
-                if key in hitter_dict and hitter_dict[key] is not None:
-                    hitter_dict[key] = int(hitter_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'AVG', 'SGCalc']:
-                if key in hitter_dict and hitter_dict[key] is not None:
-                    hitter_dict[key] = float(hitter_dict[key])
+            # Convert to a dictionary with numeric fields as Python native types
+            hitter_dict = typed_dict(hitter, HITTER_INT_KEYS, HITTER_FLOAT_KEYS)
             hitters_list.append(hitter_dict)
         
         # Get team pitchers
@@ -430,14 +419,8 @@ def get_team_roster(team_id):
         
         pitchers_list = []
         for pitcher in pitchers:
-            pitcher_dict = dict(pitcher)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'W', 'QS', 'G', 'SV', 'HLD', 'SVH', 'IP', 'SO']:
-                if key in pitcher_dict and pitcher_dict[key] is not None:
-                    pitcher_dict[key] = int(pitcher_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'ERA', 'WHIP', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc']:
-                if key in pitcher_dict and pitcher_dict[key] is not None:
-                    pitcher_dict[key] = float(pitcher_dict[key])
+            # Convert to a dictionary with numeric fields as Python native types
+            pitcher_dict = typed_dict(pitcher, PITCHER_INT_KEYS, PITCHER_FLOAT_KEYS)
             pitchers_list.append(pitcher_dict)
         
         # Combine all data
@@ -479,14 +462,8 @@ def get_team_hitters(team_id):
         
         hitters_list = []
         for hitter in hitters:
-            hitter_dict = dict(hitter)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB']:
-                if key in hitter_dict and hitter_dict[key] is not None:
-                    hitter_dict[key] = int(hitter_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'AVG', 'SGCalc']:
-                if key in hitter_dict and hitter_dict[key] is not None:
-                    hitter_dict[key] = float(hitter_dict[key])
+            # Convert to a dictionary with numeric fields as Python native types
+            hitter_dict = typed_dict(hitter, HITTER_INT_KEYS, HITTER_FLOAT_KEYS)
             hitters_list.append(hitter_dict)
         
         # Return team info and hitters
@@ -527,14 +504,8 @@ def get_team_pitchers(team_id):
         
         pitchers_list = []
         for pitcher in pitchers:
-            pitcher_dict = dict(pitcher)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'W', 'QS', 'G', 'SV', 'HLD', 'SVH', 'IP', 'SO']:
-                if key in pitcher_dict and pitcher_dict[key] is not None:
-                    pitcher_dict[key] = int(pitcher_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'ERA', 'WHIP', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc']:
-                if key in pitcher_dict and pitcher_dict[key] is not None:
-                    pitcher_dict[key] = float(pitcher_dict[key])
+            # Convert to a dictionary with numeric fields as Python native types
+            pitcher_dict = typed_dict(pitcher, PITCHER_INT_KEYS, PITCHER_FLOAT_KEYS)
             pitchers_list.append(pitcher_dict)
         # Return team info and pitchers
         result = {
@@ -562,6 +533,61 @@ PITCHER_POSITIONS = [
     'Bench1', 'Bench2', 'Bench3'
 ]
 
+def position_specs(positions):
+    """Precompute (position, is_bench, bench_index) for each roster position."""
+    return [
+        (position, position.startswith('Bench'), int(position[5:]) if position.startswith('Bench') else 0)
+        for position in positions
+    ]
+
+HITTER_POSITION_SPECS = position_specs(HITTER_POSITIONS)
+PITCHER_POSITION_SPECS = position_specs(PITCHER_POSITIONS)
+
+# Bench positions shared by hitters and pitchers in a "both" lineup
+TOTAL_BENCH_POSITIONS = 3
+
+# Roster order of each position, used to sort generated lineups
+HITTER_POSITION_ORDER = {position: index for index, position in enumerate(HITTER_POSITIONS)}
+PITCHER_POSITION_ORDER = {position: index for index, position in enumerate(PITCHER_POSITIONS)}
+
+def lineup_sort_key(player):
+    """Sort key for a combined lineup: hitters first, then pitchers, each in roster order."""
+    if player['type'] == 'hitting':
+        return (0, HITTER_POSITION_ORDER.get(player['position'], 999))
+    return (1, PITCHER_POSITION_ORDER.get(player['position'], 999))
+
+def open_positions(position_specs, filled_positions, bench_positions):
+    """List the roster positions that still need a player.
+    
+    Args:
+        position_specs (list): HITTER_POSITION_SPECS or PITCHER_POSITION_SPECS
+        filled_positions (tuple): Player IDs in position_specs order, as selected by
+            SQL_TEAM_HITTER_POSITIONS/SQL_TEAM_PITCHER_POSITIONS, or None if the team
+            has no roster row (every position is open)
+        bench_positions (int): Number of bench positions to include
+        
+    Returns:
+        list: Empty positions in roster order, with bench positions beyond
+            bench_positions left out
+    """
+    if filled_positions is None:
+        filled_positions = (None,) * len(position_specs)
+    
+    return [
+        position for (position, is_bench, bench_index), player_id in zip(position_specs, filled_positions)
+        if not player_id and (not is_bench or bench_index <= bench_positions)
+    ]
+
+# Only the position columns of a team's roster row, in HITTER_POSITIONS/PITCHER_POSITIONS order
+SQL_TEAM_HITTER_POSITIONS = f'''
+    SELECT {', '.join(HITTER_POSITIONS)} FROM TeamHitters
+    WHERE HittingTeamId = ?
+'''
+SQL_TEAM_PITCHER_POSITIONS = f'''
+    SELECT {', '.join(PITCHER_POSITIONS)} FROM TeamPitchers
+    WHERE PitchingTeamId = ?
+'''
+
 # Mapping of roster positions to actual player positions
 POSITION_MAPPING = {
     'C': ['C'],
@@ -582,6 +608,102 @@ POSITION_MAPPING = {
     'Bench3': ['C', '1B', '2B', 'SS', '3B', 'OF', 'DH']    # Any position
 }
 
+# Roster positions each player position can fill (the inverse of POSITION_MAPPING)
+POSITIONS_BY_PLAYING_POSITION = defaultdict(list)
+for roster_position, playing_positions in POSITION_MAPPING.items():
+    for playing_position in playing_positions:
+        POSITIONS_BY_PLAYING_POSITION[playing_position].append(roster_position)
+
+# Position scarcity multipliers applied to SG values
+POSITION_MULTIPLIERS = {
+    "C": 1.2,
+    "SS": 1.15,
+    "2B": 1.1,
+    "3B": 1.05,
+    "OF": 1.0,
+    "1B": 1.0,
+    "RP": 1.1,
+    "SP": 1.0
+}
+
+# Numeric columns of the Hitters and Pitchers tables, used to convert query results to Python native types
+HITTER_INT_KEYS = ('Age', 'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB')
+HITTER_FLOAT_KEYS = ('OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'AVG', 'SGCalc')
+PITCHER_INT_KEYS = ('Age', 'W', 'QS', 'G', 'SV', 'HLD', 'SVH', 'IP', 'SO')
+PITCHER_FLOAT_KEYS = ('OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'ERA', 'WHIP', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc')
+
+STANDING_INT_KEYS = ('R', 'HR', 'RBI', 'SB', 'W', 'K', 'SVH')
+STANDING_FLOAT_KEYS = ('AVG', 'ERA', 'WHIP')
+
+def typed_dict(row, int_keys, float_keys):
+    """Convert a row to a dictionary in a single pass over its columns.
+    
+    Non-null columns listed in int_keys or float_keys are converted to Python
+    int or float; every other column is copied as is.
+    """
+    return {
+        key: int(value) if value is not None and key in int_keys
+        else float(value) if value is not None and key in float_keys
+        else value
+        for key, value in zip(row.keys(), row)
+    }
+
+def typed_select_columns(columns, int_keys, float_keys):
+    """Build a SELECT column list that has SQLite cast the numeric columns.
+    
+    Rows selected with these columns already hold Python int/float values,
+    so they can be returned with dict(row) and no per-key conversion loop.
+    """
+    select_columns = []
+    for column in columns:
+        if column in int_keys:
+            select_columns.append(f'CAST({column} AS INTEGER) AS {column}')
+        elif column in float_keys:
+            select_columns.append(f'CAST({column} AS REAL) AS {column}')
+        else:
+            select_columns.append(column)
+    return ', '.join(select_columns)
+
+HITTER_COLUMNS = (
+    'HittingPlayerId', 'PlayerName', 'Team', 'Position', 'Status', 'Age', 'HittingTeamId',
+    'OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'G', 'PA', 'AB', 'H', 'HR', 'R',
+    'RBI', 'BB', 'HBP', 'SB', 'AVG', 'SGCalc'
+)
+PITCHER_COLUMNS = (
+    'PitchingPlayerId', 'PlayerName', 'Team', 'Position', 'Status', 'Age', 'PitchingTeamId',
+    'OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'W', 'QS', 'ERA', 'WHIP', 'G', 'SV',
+    'HLD', 'SVH', 'IP', 'SO', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc'
+)
+
+HITTER_SELECT_COLUMNS = typed_select_columns(HITTER_COLUMNS, HITTER_INT_KEYS, HITTER_FLOAT_KEYS)
+PITCHER_SELECT_COLUMNS = typed_select_columns(PITCHER_COLUMNS, PITCHER_INT_KEYS, PITCHER_FLOAT_KEYS)
+
+# Single-player stats lookups, kept as constants so the read connection's statement cache is hit
+SQL_GET_HITTER_STATS = f'''
+    SELECT {HITTER_SELECT_COLUMNS} FROM Hitters
+    WHERE HittingPlayerId = ?
+'''
+SQL_GET_PITCHER_STATS = f'''
+    SELECT {PITCHER_SELECT_COLUMNS} FROM Pitchers
+    WHERE PitchingPlayerId = ?
+'''
+
+# Hitters and pitchers selected together with UNION ALL need the same column list,
+# so each side pads the other's columns with NULL
+TOP_PLAYER_COLUMNS = HITTER_COLUMNS + tuple(column for column in PITCHER_COLUMNS if column not in HITTER_COLUMNS)
+HITTER_UNION_COLUMNS = typed_select_columns(
+    [column if column in HITTER_COLUMNS else f'NULL AS {column}' for column in TOP_PLAYER_COLUMNS],
+    HITTER_INT_KEYS, HITTER_FLOAT_KEYS
+)
+PITCHER_UNION_COLUMNS = typed_select_columns(
+    [column if column in PITCHER_COLUMNS else f'NULL AS {column}' for column in TOP_PLAYER_COLUMNS],
+    PITCHER_INT_KEYS, PITCHER_FLOAT_KEYS
+)
+
+# Positional getters for each type's own columns in a union row (index 0 is PlayerType)
+HITTER_UNION_VALUES = itemgetter(*[TOP_PLAYER_COLUMNS.index(column) + 1 for column in HITTER_COLUMNS])
+PITCHER_UNION_VALUES = itemgetter(*[TOP_PLAYER_COLUMNS.index(column) + 1 for column in PITCHER_COLUMNS])
+
 
 @bp.route('/teams/<int:team_id>/roster/update', methods=['POST'])
 def update_team_roster(team_id):
@@ -595,7 +717,7 @@ def update_team_roster(team_id):
     }
     """
     try:
-        print("Updating roster for team", team_id)
+        current_app.logger.debug("Updating roster for team %s", team_id)
         db = get_db()
         data = request.json
         
@@ -611,9 +733,7 @@ def update_team_roster(team_id):
         player_type = data['player_type'].lower()
         position = data['position']
         player_id = data.get('player_id')  # Can be None to remove a player
-        print("Player Id", player_id)
-        print("Player Type", player_type)
-        print("Position", position)
+        current_app.logger.debug("Player Id %s, Player Type %s, Position %s", player_id, player_type, position)
         # Validate player_type
         if player_type not in ['hitter', 'pitcher']:
             return jsonify({'error': 'player_type must be either "hitter" or "pitcher"'}), 400
@@ -747,6 +867,9 @@ def update_team_roster(team_id):
         
         db.commit()
         
+        # Rosters or available players changed, so earlier lineups are stale warm starts
+        _lineup_warm_starts.clear()
+        
         return jsonify({
             'success': True,
             'message': f'Updated {player_type} position {position} for team {team_id}'
@@ -779,6 +902,9 @@ def remove_player(player_type, player_id):
             
         db.commit()
         
+        # Rosters or available players changed, so earlier lineups are stale warm starts
+        _lineup_warm_starts.clear()
+        
         return jsonify({
             'success': True,
             'message': f'Player {player_id} removed from available players list'
@@ -811,8 +937,7 @@ def get_available_players():
                 WHERE HittingTeamId IS NULL
                 AND Status = 'FA'
             '''
-            print("Position", position)
-            print("Hitter Positions", HITTER_POSITIONS)
+            current_app.logger.debug("Position %s", position)
             # Add position filter if provided
             if position:
                 if position not in HITTER_POSITIONS:
@@ -823,11 +948,8 @@ def get_available_players():
                 
                 # No additional filtering needed for utility or bench positions (they can be any position)
                 if position not in ['Utility', 'Bench1', 'Bench2', 'Bench3']:
-                    players = db.execute(query).fetchall()
-                    
                     # Filter players based on position eligibility
-                    filtered_players = []
-                    for player in players:
+                    def is_eligible(player):
                         # Split the Position field by commas to handle multiple positions
                         # For example, a player with Position="2B,SS,3B,OF" will have
                         # player_positions = ["2B", "SS", "3B", "OF"]
@@ -835,17 +957,9 @@ def get_available_players():
                         
                         # Check if player is eligible for any of the required positions
                         # A player is eligible if ANY of their positions matches ANY of the eligible positions
-                        is_eligible = False
-                        for pos in player_positions:
-                            pos = pos.strip()  # Remove any whitespace
-                            if pos in eligible_positions:
-                                is_eligible = True
-                                break
-                        
-                        if is_eligible:
-                            filtered_players.append(player)
+                        return any(pos.strip() in eligible_positions for pos in player_positions)
                     
-                    players = filtered_players
+                    players = filter(is_eligible, db.execute(query).fetchall())
                 else:
                     # For utility and bench positions, all hitters are eligible
                     players = db.execute(query).fetchall()
@@ -853,18 +967,7 @@ def get_available_players():
                 # No position filter, return all available hitters
                 players = db.execute(query).fetchall()
             
-            # Convert to list of dictionaries and ensure numeric values are Python native types
-            result = []
-            for player in players:
-                player_dict = dict(player)
-                # Convert numeric fields to appropriate Python types
-                for key in ['Age', 'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB']:
-                    if key in player_dict and player_dict[key] is not None:
-                        player_dict[key] = int(player_dict[key])
-                for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'AVG', 'SGCalc']:
-                    if key in player_dict and player_dict[key] is not None:
-                        player_dict[key] = float(player_dict[key])
-                result.append(player_dict)
+            int_keys, float_keys = HITTER_INT_KEYS, HITTER_FLOAT_KEYS
         else:  # pitcher
             query = '''
                 SELECT * FROM Pitchers 
@@ -879,18 +982,11 @@ def get_available_players():
             else:
                 players = db.execute(query).fetchall()
             
-            # Convert to list of dictionaries and ensure numeric values are Python native types
-            result = []
-            for player in players:
-                player_dict = dict(player)
-                # Convert numeric fields to appropriate Python types
-                for key in ['Age', 'W', 'QS', 'G', 'SV', 'HLD', 'SVH', 'IP', 'SO']:
-                    if key in player_dict and player_dict[key] is not None:
-                        player_dict[key] = int(player_dict[key])
-                for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'ERA', 'WHIP', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc']:
-                    if key in player_dict and player_dict[key] is not None:
-                        player_dict[key] = float(player_dict[key])
-                result.append(player_dict)
+            int_keys, float_keys = PITCHER_INT_KEYS, PITCHER_FLOAT_KEYS
+        
+        # Convert to list of dictionaries and ensure numeric values are Python native types
+        result = [typed_dict(player, int_keys, float_keys) for player in players]
+        
         return jsonify({
             'player_type': player_type,
             'position': position,
@@ -907,86 +1003,81 @@ def get_team_roster_structure(team_id):
     try:
         db = get_db()
         
+        # Get the team along with its TeamHitters and TeamPitchers rows in one query.
+        # Both roster tables have Bench1-3 columns, so each side is aliased with a prefix.
+        roster_columns = ', '.join(
+            [f'th.{position} AS th_{position}' for position in HITTER_POSITIONS] +
+            [f'tp.{position} AS tp_{position}' for position in PITCHER_POSITIONS]
+        )
+        row = db.execute(f'''
+            SELECT t.TeamId, t.TeamName, t.Owner, t.Salary, {roster_columns}
+            FROM Teams t
+            LEFT JOIN TeamHitters th ON th.HittingTeamId = t.TeamId
+            LEFT JOIN TeamPitchers tp ON tp.PitchingTeamId = t.TeamId
+            WHERE t.TeamId = ?
+        ''', (team_id,)).fetchone()
+        
         # Check if team exists
-        team = db.execute('SELECT TeamId, TeamName, Owner, Salary FROM Teams WHERE TeamId = ?', (team_id,)).fetchone()
-        if not team:
+        if not row:
             return jsonify({'error': f'No team found with TeamId {team_id}'}), 404
         
         # Get team basic info
-        team_dict = dict(team)
-        if 'Salary' in team_dict and team_dict['Salary'] is not None:
+        team_dict = {key: row[key] for key in ['TeamId', 'TeamName', 'Owner', 'Salary']}
+        if team_dict['Salary'] is not None:
             team_dict['Salary'] = float(team_dict['Salary'])
         
+        # Player IDs by roster position (all None if no TeamHitters/TeamPitchers record exists yet)
+        hitter_ids = {position: row[f'th_{position}'] for position in HITTER_POSITIONS}
+        pitcher_ids = {position: row[f'tp_{position}'] for position in PITCHER_POSITIONS}
+        
         # Get hitter positions
+        hitters_by_id = {}
+        filled_hitter_ids = [player_id for player_id in hitter_ids.values() if player_id]
+        if filled_hitter_ids:
+            # Get player details with additional stats for every filled position at once
+            players = db.execute('''
+                SELECT HittingPlayerId, PlayerName, Position, Status, 
+                       HR, R, RBI, SB, AVG, SGCalc
+                FROM Hitters 
+                WHERE HittingPlayerId IN ({})
+            '''.format(','.join(['?'] * len(filled_hitter_ids))), filled_hitter_ids).fetchall()
+            
+            for player in players:
+                # Convert to a dictionary with numeric fields as Python native types
+                player_dict = typed_dict(player, HITTER_INT_KEYS, HITTER_FLOAT_KEYS)
+                hitters_by_id[player_dict['HittingPlayerId']] = player_dict
+        
         hitter_positions = {}
-        team_hitters = db.execute('SELECT * FROM TeamHitters WHERE HittingTeamId = ?', (team_id,)).fetchone()
-        
-        if team_hitters:
-            team_hitters_dict = dict(team_hitters)
-            for position in HITTER_POSITIONS:
-                player_id = team_hitters_dict.get(position)
-                if player_id:
-                    # Get player details with additional stats
-                    player = db.execute('''
-                        SELECT HittingPlayerId, PlayerName, Position, Status, 
-                               HR, R, RBI, SB, AVG, SGCalc
-                        FROM Hitters 
-                        WHERE HittingPlayerId = ?
-                    ''', (player_id,)).fetchone()
-                    if player:
-                        player_dict = dict(player)
-                        # Convert numeric fields to appropriate Python types
-                        for key in ['HR', 'R', 'RBI', 'SB']:
-                            if key in player_dict and player_dict[key] is not None:
-                                player_dict[key] = int(player_dict[key])
-                        for key in ['AVG', 'SGCalc']:
-                            if key in player_dict and player_dict[key] is not None:
-                                player_dict[key] = float(player_dict[key])
-                        hitter_positions[position] = player_dict
-                    else:
-                        # Handle case where player ID exists in TeamHitters but not in Hitters table
-                        hitter_positions[position] = {'HittingPlayerId': player_id, 'PlayerName': 'Unknown Player', 'Position': 'Unknown', 'Status': 'Unknown'}
-                else:
-                    hitter_positions[position] = None
-        else:
-            # No TeamHitters record exists yet
-            for position in HITTER_POSITIONS:
+        for position, player_id in hitter_ids.items():
+            if player_id:
+                # Handle case where player ID exists in TeamHitters but not in Hitters table
+                hitter_positions[position] = hitters_by_id.get(player_id) or {'HittingPlayerId': player_id, 'PlayerName': 'Unknown Player', 'Position': 'Unknown', 'Status': 'Unknown'}
+            else:
                 hitter_positions[position] = None
         
         # Get pitcher positions
+        pitchers_by_id = {}
+        filled_pitcher_ids = [player_id for player_id in pitcher_ids.values() if player_id]
+        if filled_pitcher_ids:
+            # Get player details with additional stats for every filled position at once
+            players = db.execute('''
+                SELECT PitchingPlayerId, PlayerName, Position, Status,
+                       W, SO, ERA, WHIP, SVH, SGCalc
+                FROM Pitchers 
+                WHERE PitchingPlayerId IN ({})
+            '''.format(','.join(['?'] * len(filled_pitcher_ids))), filled_pitcher_ids).fetchall()
+            
+            for player in players:
+                # Convert to a dictionary with numeric fields as Python native types
+                player_dict = typed_dict(player, PITCHER_INT_KEYS, PITCHER_FLOAT_KEYS)
+                pitchers_by_id[player_dict['PitchingPlayerId']] = player_dict
+        
         pitcher_positions = {}
-        team_pitchers = db.execute('SELECT * FROM TeamPitchers WHERE PitchingTeamId = ?', (team_id,)).fetchone()
-        
-        if team_pitchers:
-            team_pitchers_dict = dict(team_pitchers)
-            for position in PITCHER_POSITIONS:
-                player_id = team_pitchers_dict.get(position)
-                if player_id:
-                    # Get player details with additional stats
-                    player = db.execute('''
-                        SELECT PitchingPlayerId, PlayerName, Position, Status,
-                               W, SO, ERA, WHIP, SVH, SGCalc
-                        FROM Pitchers 
-                        WHERE PitchingPlayerId = ?
-                    ''', (player_id,)).fetchone()
-                    if player:
-                        player_dict = dict(player)
-                        # Convert numeric fields to appropriate Python types
-                        for key in ['W', 'SO', 'SVH']:
-                            if key in player_dict and player_dict[key] is not None:
-                                player_dict[key] = int(player_dict[key])
-                        for key in ['ERA', 'WHIP', 'SGCalc']:
-                            if key in player_dict and player_dict[key] is not None:
-                                player_dict[key] = float(player_dict[key])
-                        pitcher_positions[position] = player_dict
-                    else:
-                        # Handle case where player ID exists in TeamPitchers but not in Pitchers table
-                        pitcher_positions[position] = {'PitchingPlayerId': player_id, 'PlayerName': 'Unknown Player', 'Position': 'Unknown', 'Status': 'Unknown'}
-                else:
-                    pitcher_positions[position] = None
-        else:
-            # No TeamPitchers record exists yet
-            for position in PITCHER_POSITIONS:
+        for position, player_id in pitcher_ids.items():
+            if player_id:
+                # Handle case where player ID exists in TeamPitchers but not in Pitchers table
+                pitcher_positions[position] = pitchers_by_id.get(player_id) or {'PitchingPlayerId': player_id, 'PlayerName': 'Unknown Player', 'Position': 'Unknown', 'Status': 'Unknown'}
+            else:
                 pitcher_positions[position] = None
         
         return jsonify({
@@ -1300,7 +1391,7 @@ def calculate_standard_gains():
     """
     try:
         data = request.get_json()
-        print("DATA", data)
+        current_app.logger.debug("DATA %s", data)
         if not data:
             return jsonify({"error": "No data provided"}), 400
             
@@ -1310,33 +1401,43 @@ def calculate_standard_gains():
         if not team_id or not model_id:
             return jsonify({"error": "Missing required parameters: team_id and model_id"}), 400
         
+        db = get_db()
+        
         # Get current team stats
-        team_stats = get_current_team_stats(team_id)
-        print("TEAM STATS", team_stats)
+        team_stats = get_current_team_stats(db, team_id)
+        current_app.logger.debug("TEAM STATS %s", team_stats)
         # Get threshold values from the model
         thresholds = get_model_thresholds(model_id)
-        print("THRESHOLDS", thresholds)
+        current_app.logger.debug("THRESHOLDS %s", thresholds)
         # Calculate gaps between current stats and thresholds
         gaps = calculate_category_gaps(team_stats, thresholds)
-        print("GAP", gaps)
-        # Get available players (not on this team)
-        available_hitters = get_available_hitters(team_id)
-        available_pitchers = get_available_pitchers(team_id)
-        print("AVALABLE PLAYERS RETRIEVED")
-        # Calculate SG values for hitters and update database
-        for hitter in available_hitters:
-            sg_value = calculate_sg_value(hitter, team_stats, gaps, is_hitter=True)
-            update_player_sg(hitter["HittingPlayerId"], sg_value, is_hitter=True)
-        print("HITTERS COMPLETE")
+        current_app.logger.debug("GAP %s", gaps)
+        # Calculate SG values for available players (not on this team) and update database
+        hitter_sg_values = []
+        for hitters in iter_available_sg_inputs(db, team_id, is_hitter=True):
+            sg_values = calculate_sg_values(hitters, team_stats, gaps, is_hitter=True).tolist()
+            # Only write the values that changed since they were last stored
+            hitter_sg_values.extend(
+                (hitter["HittingPlayerId"], sg_value) for hitter, sg_value in zip(hitters, sg_values)
+                if sg_value != hitter["SGCalc"]
+            )
+        update_players_sg(db, hitter_sg_values, is_hitter=True)
+        current_app.logger.debug("HITTERS COMPLETE")
         # Calculate SG values for pitchers and update database
-        for pitcher in available_pitchers:
-            sg_value = calculate_sg_value(pitcher, team_stats, gaps, is_hitter=False)
-            update_player_sg(pitcher["PitchingPlayerId"], sg_value, is_hitter=False)
-        print("PITCHERS COMPLETE")
+        pitcher_sg_values = []
+        for pitchers in iter_available_sg_inputs(db, team_id, is_hitter=False):
+            sg_values = calculate_sg_values(pitchers, team_stats, gaps, is_hitter=False).tolist()
+            # Only write the values that changed since they were last stored
+            pitcher_sg_values.extend(
+                (pitcher["PitchingPlayerId"], sg_value) for pitcher, sg_value in zip(pitchers, sg_values)
+                if sg_value != pitcher["SGCalc"]
+            )
+        update_players_sg(db, pitcher_sg_values, is_hitter=False)
+        db.commit()
+        current_app.logger.debug("PITCHERS COMPLETE")
         # Get top players by SGCalc
-        top_hitters = get_top_players_by_sg(is_hitter=True, limit=25)
-        top_pitchers = get_top_players_by_sg(is_hitter=False, limit=25)
-        print("TOP PLAYERS RETRIEVED", top_hitters, top_pitchers)
+        top_hitters, top_pitchers = get_top_hitters_and_pitchers_by_sg(db, limit=25)
+        current_app.logger.debug("TOP PLAYERS RETRIEVED %s %s", top_hitters, top_pitchers)
         return jsonify({
             "status": "success",
             "team_stats": team_stats,
@@ -1348,14 +1449,12 @@ def calculate_standard_gains():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-def get_current_team_stats(team_id):
+def get_current_team_stats(db, team_id):
     """Get the current statistics for a team.
     
     This combines hitting and pitching stats into a single dictionary.
     """
     try:
-        db = get_db()
-        
         # Check if team exists
         team = db.execute('SELECT TeamId, TeamName, Owner FROM Teams WHERE TeamId = ?', (team_id,)).fetchone()
         if not team:
@@ -1428,13 +1527,32 @@ def get_current_team_stats(team_id):
         
         return team_stats
     except Exception as e:
-        print("ERROR", e)
+        current_app.logger.error(f"Error calculating current team stats: {str(e)}")
         return None
 
-def calculate_optimized_team_stats(team_id, optimized_hitters=None, optimized_pitchers=None):
+# The lineup player IDs are passed as one JSON array parameter, so the SQL text
+# is the same for any lineup size and its prepared statement is reused
+SQL_OPTIMIZED_HITTING_TOTALS = '''
+    SELECT COALESCE(SUM(R), 0) AS R, COALESCE(SUM(HR), 0) AS HR,
+           COALESCE(SUM(RBI), 0) AS RBI, COALESCE(SUM(SB), 0) AS SB,
+           COALESCE(SUM(AB), 0) AS AB, COALESCE(SUM(H), 0) AS H
+    FROM Hitters
+    WHERE HittingTeamId = ? OR HittingPlayerId IN (SELECT value FROM json_each(?))
+'''
+SQL_OPTIMIZED_PITCHING_TOTALS = '''
+    SELECT COALESCE(SUM(W), 0) AS W, COALESCE(SUM(SO), 0) AS K,
+           COALESCE(SUM(SVH), 0) AS SVH, COALESCE(SUM(IP), 0) AS IP,
+           COALESCE(SUM(ERA * IP), 0) / 9.0 AS ER,
+           COALESCE(SUM(WHIP * IP), 0) AS WHIP_PRODUCT
+    FROM Pitchers
+    WHERE PitchingTeamId = ? OR PitchingPlayerId IN (SELECT value FROM json_each(?))
+'''
+
+def calculate_optimized_team_stats(db, team_id, optimized_hitters=None, optimized_pitchers=None):
     """Calculate optimized team stats based on the current team and the optimized lineup.
     
     Args:
+        db (sqlite3.Connection): The request's database connection
         team_id (int): The team ID
         optimized_hitters (list): List of hitter player IDs in the optimized lineup
         optimized_pitchers (list): List of pitcher player IDs in the optimized lineup
@@ -1443,8 +1561,6 @@ def calculate_optimized_team_stats(team_id, optimized_hitters=None, optimized_pi
         dict: A dictionary containing optimized hitting and pitching stats
     """
     try:
-        db = get_db()
-        
         # Check if team exists
         team = db.execute('SELECT TeamId, TeamName, Owner FROM Teams WHERE TeamId = ?', (team_id,)).fetchone()
         if not team:
@@ -1461,122 +1577,37 @@ def calculate_optimized_team_stats(team_id, optimized_hitters=None, optimized_pi
         
         # Process hitters if provided
         if optimized_hitters and len(optimized_hitters) > 0:
-            # Get current team hitters that are not in the optimized lineup
-            current_hitters = db.execute('''
-                SELECT * FROM Hitters
-                WHERE HittingTeamId = ? AND HittingPlayerId NOT IN ({})
-            '''.format(','.join(['?'] * len(optimized_hitters))), 
-            (team_id, *optimized_hitters)).fetchall()
-            
-            # Get the optimized hitters' stats
-            optimized_hitter_stats = db.execute('''
-                SELECT * FROM Hitters
-                WHERE HittingPlayerId IN ({})
-            '''.format(','.join(['?'] * len(optimized_hitters))),
-            optimized_hitters).fetchall()
-            
-            # Calculate raw hitting totals
-            total_ab = 0
-            total_hits = 0
+            # Totals for the current team hitters plus the optimized hitters. A player who is
+            # both on the team and in the optimized lineup matches once, so one pass covers both.
+            totals = db.execute(SQL_OPTIMIZED_HITTING_TOTALS, (team_id, json.dumps(optimized_hitters))).fetchone()
             
-            # Add stats from current team hitters not in optimized lineup
-            for hitter in current_hitters:
-                optimized_hitting_stats["R"] += hitter["R"] if hitter["R"] is not None else 0
-                optimized_hitting_stats["HR"] += hitter["HR"] if hitter["HR"] is not None else 0
-                optimized_hitting_stats["RBI"] += hitter["RBI"] if hitter["RBI"] is not None else 0
-                optimized_hitting_stats["SB"] += hitter["SB"] if hitter["SB"] is not None else 0
-                
-                # For AVG calculation
-                ab = hitter["AB"] if hitter["AB"] is not None else 0
-                hits = hitter["H"] if hitter["H"] is not None else 0
-                total_ab += ab
-                total_hits += hits
-            
-            # Add stats from optimized hitters
-            for hitter in optimized_hitter_stats:
-                optimized_hitting_stats["R"] += hitter["R"] if hitter["R"] is not None else 0
-                optimized_hitting_stats["HR"] += hitter["HR"] if hitter["HR"] is not None else 0
-                optimized_hitting_stats["RBI"] += hitter["RBI"] if hitter["RBI"] is not None else 0
-                optimized_hitting_stats["SB"] += hitter["SB"] if hitter["SB"] is not None else 0
-                
-                # For AVG calculation
-                ab = hitter["AB"] if hitter["AB"] is not None else 0
-                hits = hitter["H"] if hitter["H"] is not None else 0
-                total_ab += ab
-                total_hits += hits
+            for stat in ["R", "HR", "RBI", "SB"]:
+                optimized_hitting_stats[stat] = totals[stat]
             
             # Calculate AVG
-            optimized_hitting_stats["AVG"] = total_hits / total_ab if total_ab > 0 else 0.0
+            optimized_hitting_stats["AVG"] = totals["H"] / totals["AB"] if totals["AB"] > 0 else 0.0
         
         # Process pitchers if provided
         if optimized_pitchers and len(optimized_pitchers) > 0:
-            # Get current team pitchers that are not in the optimized lineup
-            current_pitchers = db.execute('''
-                SELECT * FROM Pitchers
-                WHERE PitchingTeamId = ? AND PitchingPlayerId NOT IN ({})
-            '''.format(','.join(['?'] * len(optimized_pitchers))), 
-            (team_id, *optimized_pitchers)).fetchall()
-            
-            # Get the optimized pitchers' stats
-            optimized_pitcher_stats = db.execute('''
-                SELECT * FROM Pitchers
-                WHERE PitchingPlayerId IN ({})
-            '''.format(','.join(['?'] * len(optimized_pitchers))),
-            optimized_pitchers).fetchall()
-            
-            # Calculate raw pitching totals
-            total_innings = 0
-            total_earned_runs = 0  # For ERA calculation
-            total_whip_product = 0  # For WHIP calculation
-            
-            # Add stats from current team pitchers not in optimized lineup
-            for pitcher in current_pitchers:
-                optimized_pitching_stats["W"] += pitcher["W"] if pitcher["W"] is not None else 0
-                optimized_pitching_stats["K"] += pitcher["SO"] if pitcher["SO"] is not None else 0
-                optimized_pitching_stats["SVH"] += pitcher["SVH"] if pitcher["SVH"] is not None else 0
-                
-                # For ERA and WHIP calculation
-                ip = pitcher["IP"] if pitcher["IP"] is not None else 0
-                era = pitcher["ERA"] if pitcher["ERA"] is not None else 0
-                whip = pitcher["WHIP"] if pitcher["WHIP"] is not None else 0
-                
-                # Back-calculate earned runs: ER = (ERA * IP) / 9
-                earned_runs = (era * ip) / 9
-                
-                total_innings += ip
-                total_earned_runs += earned_runs
-                total_whip_product += whip * ip  # For weighted WHIP
+            # Totals for the current team pitchers plus the optimized pitchers. Earned runs are
+            # back-calculated as ER = (ERA * IP) / 9 and WHIP is weighted by IP.
+            totals = db.execute(SQL_OPTIMIZED_PITCHING_TOTALS, (team_id, json.dumps(optimized_pitchers))).fetchone()
             
-            # Add stats from optimized pitchers
-            for pitcher in optimized_pitcher_stats:
-                optimized_pitching_stats["W"] += pitcher["W"] if pitcher["W"] is not None else 0
-                optimized_pitching_stats["K"] += pitcher["SO"] if pitcher["SO"] is not None else 0
-                optimized_pitching_stats["SVH"] += pitcher["SVH"] if pitcher["SVH"] is not None else 0
-                
-                # For ERA and WHIP calculation
-                ip = pitcher["IP"] if pitcher["IP"] is not None else 0
-                era = pitcher["ERA"] if pitcher["ERA"] is not None else 0
-                whip = pitcher["WHIP"] if pitcher["WHIP"] is not None else 0
-                
-                # Back-calculate earned runs: ER = (ERA * IP) / 9
-                earned_runs = (era * ip) / 9
-                
-                total_innings += ip
-                total_earned_runs += earned_runs
-                total_whip_product += whip * ip  # For weighted WHIP
+            for stat in ["W", "K", "SVH"]:
+                optimized_pitching_stats[stat] = totals[stat]
             
             # Calculate weighted ERA and WHIP
-            if total_innings > 0:
+            if totals["IP"] > 0:
                 # ERA = (9 * total_earned_runs) / total_innings
-                optimized_pitching_stats["ERA"] = (9 * total_earned_runs) / total_innings
-                optimized_pitching_stats["WHIP"] = total_whip_product / total_innings
+                optimized_pitching_stats["ERA"] = (9 * totals["ER"]) / totals["IP"]
+                optimized_pitching_stats["WHIP"] = totals["WHIP_PRODUCT"] / totals["IP"]
         
         return {
             "optimized_hitting_stats": optimized_hitting_stats,
             "optimized_pitching_stats": optimized_pitching_stats
         }
     except Exception as e:
-        print("ERROR calculating optimized stats:", e)
+        current_app.logger.error(f"Error calculating optimized stats: {str(e)}")
         return {
             "optimized_hitting_stats": {},
             "optimized_pitching_stats": {}
@@ -1584,6 +1615,16 @@ def calculate_optimized_team_stats(team_id, optimized_hitters=None, optimized_pi
 
 def get_model_thresholds(model_id):
     """Get the threshold values from a specific model."""
+    return dict(load_model_thresholds(current_app.config['DATABASE'], model_id))
+
+@lru_cache(maxsize=32)
+def load_model_thresholds(database, model_id):
+    """Read a model's thresholds from the Standings table.
+    
+    Standings rows only change when the database is re-initialized, so results
+    are cached per database path and model. Call load_model_thresholds.cache_clear()
+    after modifying the Standings table.
+    """
     db = get_db()
     
     # Get model data from Standings table
@@ -1620,162 +1661,308 @@ def calculate_category_gaps(team_stats, thresholds):
     
     return gaps
 
-def get_available_hitters(team_id):
+def get_available_hitters(db, team_id):
     """Get all hitters not on the specified team and with 'FA' status."""
-    db = get_db()
-    
-    hitters = db.execute('''
+    return query_dicts(db, '''
         SELECT * FROM Hitters
         WHERE (HittingTeamId IS NULL OR HittingTeamId != ?)
         AND Status = 'FA'
-    ''', (team_id,)).fetchall()
-    
-    return [dict(hitter) for hitter in hitters]
+    ''', (team_id,))
 
-def get_available_pitchers(team_id):
+def get_available_pitchers(db, team_id):
     """Get all pitchers not on the specified team and with 'FA' status."""
-    db = get_db()
-    
-    pitchers = db.execute('''
+    return query_dicts(db, '''
         SELECT * FROM Pitchers
         WHERE (PitchingTeamId IS NULL OR PitchingTeamId != ?)
         AND Status = 'FA'
-    ''', (team_id,)).fetchall()
+    ''', (team_id,))
+
+# Player stats used by calculate_sg_values, with getters that read them from a row in one call
+SG_HITTER_STATS = ('R', 'HR', 'RBI', 'SB', 'AB', 'H')
+SG_PITCHER_STATS = ('W', 'SO', 'SVH', 'IP', 'ERA', 'WHIP')
+SG_STAT_VALUES = {
+    True: itemgetter(*SG_HITTER_STATS),
+    False: itemgetter(*SG_PITCHER_STATS)
+}
+
+# Rows fetched per batch when streaming available players for SG calculation
+AVAILABLE_PLAYER_BATCH_SIZE = 200
+
+def iter_available_sg_inputs(db, team_id, is_hitter):
+    """Yield available players in batches, with only their SGCalc and the columns calculate_sg_values needs.
+    
+    Rows are pulled from the cursor with fetchmany, so the SG calculation for
+    one batch runs before the next is read and no full player list is built.
+    
+    Args:
+        db (sqlite3.Connection): The request's database connection
+        team_id (int): The team the players are being picked for
+        is_hitter (bool): True for hitters, False for pitchers
+        
+    Yields:
+        list: Up to AVAILABLE_PLAYER_BATCH_SIZE player dicts
+    """
+    if is_hitter:
+        table, id_column, team_column = 'Hitters', 'HittingPlayerId', 'HittingTeamId'
+        stats = SG_HITTER_STATS
+    else:
+        table, id_column, team_column = 'Pitchers', 'PitchingPlayerId', 'PitchingTeamId'
+        stats = SG_PITCHER_STATS
     
-    return [dict(pitcher) for pitcher in pitchers]
+    cursor = db.cursor()
+    cursor.row_factory = None
+    cursor.arraysize = AVAILABLE_PLAYER_BATCH_SIZE
+    cursor.execute(f'''
+        SELECT {id_column}, Position, SGCalc, {', '.join(stats)} FROM {table}
+        WHERE ({team_column} IS NULL OR {team_column} != ?)
+        AND Status = 'FA'
+    ''', (team_id,))
+    
+    columns = [column[0] for column in cursor.description]
+    rows = cursor.fetchmany()
+    while rows:
+        yield [dict(zip(columns, row)) for row in rows]
+        rows = cursor.fetchmany()
 
-def calculate_sg_value(player, team_stats, gaps, is_hitter):
-    """Calculate the Standard Gains value for a player."""
-    # Initialize SG value
-    sg_value = 0
+def calculate_sg_values(players, team_stats, gaps, is_hitter):
+    """Calculate the Standard Gains values for a list of players in one pass.
+    
+    The stats are pulled out of the player dicts into one NumPy array, so every
+    category contribution is computed for all players at once instead of
+    looping over the players one at a time.
+    
+    Args:
+        players (list): Player dictionaries (Hitters or Pitchers rows)
+        team_stats (dict): Current team stats from get_current_team_stats
+        gaps (dict): Category gaps from calculate_category_gaps
+        is_hitter (bool): True for hitters, False for pitchers
+        
+    Returns:
+        numpy.ndarray: SG values in the same order as players
+    """
+    # Pull every stat the formula needs out of the player dicts in a single pass
+    keys = SG_HITTER_STATS if is_hitter else SG_PITCHER_STATS
+    stats = np.array([SG_STAT_VALUES[is_hitter](player) for player in players], dtype=np.float64)
+    stats = stats.reshape(len(players), len(keys))
+    
+    # Missing stats (None, loaded as NaN) count as 0
+    stats[np.isnan(stats)] = 0
+    columns = dict(zip(keys, stats.T))
+    
+    def column(key):
+        return columns[key]
+    
+    # Initialize SG values
+    sg_values = np.zeros(len(players))
     
     if is_hitter:
-        # Calculate how much this player helps for each hitting category
+        # Calculate how much each player helps for each hitting category
         for stat in ["R", "HR", "RBI", "SB"]:
             if gaps[stat] > 0:  # Only count stats where we need improvement
-                player_stat = player[stat] if player[stat] is not None else 0
                 # Each point of contribution in this category is weighted by how far we are from target
-                sg_value += (player_stat / gaps[stat])
+                sg_values += column(stat) / gaps[stat]
         
         # Handle AVG differently (contribution depends on AB)
         if gaps["AVG"] > 0:
-            ab = player["AB"] if player["AB"] is not None else 0
-            hits = player["H"] if player["H"] is not None else 0
-            
-            if ab > 0:
-                player_avg = hits / ab
-                # Player's contribution to team AVG is weighted by their AB
-                player_avg_impact = (player_avg - team_stats["AVG"]) * ab
-                sg_value += (player_avg_impact / gaps["AVG"])
+            ab = column("AB")
+            hits = column("H")
+            has_ab = ab > 0
+            
+            # Player's contribution to team AVG is weighted by their AB
+            player_avg = hits / np.where(has_ab, ab, 1)
+            player_avg_impact = np.where(has_ab, (player_avg - team_stats["AVG"]) * ab, 0)
+            sg_values += player_avg_impact / gaps["AVG"]
     else:  # Pitcher
         # Calculate pitching contributions
         for stat in ["W", "K", "SVH"]:
             player_stat = stat if stat != "K" else "SO"
             if gaps[stat] > 0:
-                player_stat = player[player_stat] if player[player_stat] is not None else 0
-                sg_value += (player_stat / gaps[stat])
+                sg_values += column(player_stat) / gaps[stat]
         
         # Handle ERA and WHIP (lower is better)
+        ip = column("IP")
+        has_ip = ip > 0
+        
         if gaps["ERA"] > 0:
-            ip = player["IP"] if player["IP"] is not None else 0
-            era = player["ERA"] if player["ERA"] is not None else 0
-            if ip > 0:
-                era_impact = (team_stats["ERA"] - era) * ip
-                sg_value += (era_impact / gaps["ERA"])
+            era_impact = np.where(has_ip, (team_stats["ERA"] - column("ERA")) * ip, 0)
+            sg_values += era_impact / gaps["ERA"]
         
         if gaps["WHIP"] > 0:
-            ip = player["IP"] if player["IP"] is not None else 0
-            whip = player["WHIP"] if player["WHIP"] is not None else 0
-            if ip > 0:
-                whip_impact = (team_stats["WHIP"] - whip) * ip
-                sg_value += (whip_impact / gaps["WHIP"])
+            whip_impact = np.where(has_ip, (team_stats["WHIP"] - column("WHIP")) * ip, 0)
+            sg_values += whip_impact / gaps["WHIP"]
     
     # Apply position scarcity multipliers (optional)
-    position_multipliers = {
-        "C": 1.2,
-        "SS": 1.15,
-        "2B": 1.1,
-        "3B": 1.05,
-        "OF": 1.0,
-        "1B": 1.0,
-        "RP": 1.1,
-        "SP": 1.0
-    }
-    
-    if is_hitter and "Position" in player:
-        sg_value *= position_multipliers.get(player["Position"], 1.0)
-    elif not is_hitter and "Role" in player:
-        sg_value *= position_multipliers.get(player["Role"], 1.0)
+    position_key = "Position" if is_hitter else "Role"
+    sg_values *= np.fromiter(
+        (POSITION_MULTIPLIERS.get(player[position_key], 1.0) if position_key in player else 1.0 for player in players),
+        dtype=np.float64,
+        count=len(players)
+    )
     
-    return sg_value
+    return sg_values
 
-def update_player_sg(player_id, sg_value, is_hitter):
-    """Update the SGCalc value for a player in the database."""
-    db = get_db()
+# Rows per UPDATE statement; two bound parameters per row keeps each
+# statement under SQLite's default 999-variable limit on older builds
+SG_UPDATE_CHUNK_SIZE = 400
+
+def update_players_sg(db, sg_values, is_hitter):
+    """Update the SGCalc value for many players in the database at once.
+    
+    Rather than issuing one UPDATE per player, the (player_id, sg_value) pairs
+    are bound into a VALUES table and applied with a single UPDATE statement.
+    The caller is responsible for committing, so several batches can share
+    one transaction.
+    
+    Args:
+        db (sqlite3.Connection): The request's database connection
+        sg_values (list): List of (player_id, sg_value) tuples
+        is_hitter (bool): True to update Hitters, False to update Pitchers
+    """
+    if not sg_values:
+        return
     
     if is_hitter:
-        db.execute('''
-            UPDATE Hitters
-            SET SGCalc = ?
-            WHERE HittingPlayerId = ?
-        ''', (sg_value, player_id))
+        table, id_column = 'Hitters', 'HittingPlayerId'
     else:
-        db.execute('''
-            UPDATE Pitchers
-            SET SGCalc = ?
-            WHERE PitchingPlayerId = ?
-        ''', (sg_value, player_id))
+        table, id_column = 'Pitchers', 'PitchingPlayerId'
     
-    db.commit()
+    for start in range(0, len(sg_values), SG_UPDATE_CHUNK_SIZE):
+        chunk = sg_values[start:start + SG_UPDATE_CHUNK_SIZE]
+        values_clause = ', '.join(['(?, ?)'] * len(chunk))
+        params = [value for pair in chunk for value in pair]
+        
+        db.execute(f'''
+            WITH sg(id, val) AS (VALUES {values_clause})
+            UPDATE {table}
+            SET SGCalc = (SELECT val FROM sg WHERE sg.id = {id_column})
+            WHERE {id_column} IN (SELECT id FROM sg)
+        ''', params)
 
-def get_top_players_by_sg(is_hitter, limit=25):
-    """Get the top players by SGCalc value."""
-    db = get_db()
+def update_missing_sg(db, team_id, team_stats, gaps, is_hitter):
+    """Calculate SGCalc in SQLite for available players that don't have one yet.
+    
+    Uses the same formula as calculate_sg_values, written as a single UPDATE
+    expression with the team stats and gaps bound as parameters, so the
+    players never have to be loaded into Python. Values are bound as floats
+    so SQLite never falls back to integer division. Players that already have an
+    SGCalc value are left unchanged. The caller is responsible for committing.
+    
+    Args:
+        db (sqlite3.Connection): The request's database connection
+        team_id (int): The team the players are being picked for
+        team_stats (dict): Current team stats from get_current_team_stats
+        gaps (dict): Category gaps from calculate_category_gaps
+        is_hitter (bool): True to update Hitters, False to update Pitchers
+    """
+    terms = []
+    params = []
     
     if is_hitter:
-        players = db.execute('''
-            SELECT * FROM Hitters
-            WHERE SGCalc IS NOT NULL AND Status = 'FA'
-            ORDER BY SGCalc DESC
-            LIMIT ?
-        ''', (limit,)).fetchall()
+        table, team_column = 'Hitters', 'HittingTeamId'
         
-        # Convert to list of dictionaries with proper types
-        result = []
-        for player in players:
-            player_dict = dict(player)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = int(player_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'AVG', 'SGCalc']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = float(player_dict[key])
-            result.append(player_dict)
-        
-        return result
+        for stat in ["R", "HR", "RBI", "SB"]:
+            if gaps[stat] > 0:
+                terms.append(f'COALESCE({stat}, 0) / ?')
+                params.append(float(gaps[stat]))
+        
+        # Player's contribution to team AVG is weighted by their AB
+        if gaps["AVG"] > 0:
+            terms.append('''
+                CASE WHEN COALESCE(AB, 0) > 0
+                    THEN (CAST(COALESCE(H, 0) AS REAL) / AB - ?) * AB
+                    ELSE 0 END / ?
+            ''')
+            params.extend([float(team_stats["AVG"]), float(gaps["AVG"])])
+        
+        # Apply position scarcity multipliers
+        multiplier = 'CASE Position ' + ' '.join(
+            f"WHEN '{position}' THEN {value}" for position, value in POSITION_MULTIPLIERS.items()
+        ) + ' ELSE 1.0 END'
     else:
-        players = db.execute('''
-            SELECT * FROM Pitchers
-            WHERE SGCalc IS NOT NULL AND Status = 'FA'
-            ORDER BY SGCalc DESC
-            LIMIT ?
-        ''', (limit,)).fetchall()
+        table, team_column = 'Pitchers', 'PitchingTeamId'
         
-        # Convert to list of dictionaries with proper types
-        result = []
-        for player in players:
-            player_dict = dict(player)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'W', 'QS', 'G', 'SV', 'HLD', 'SVH', 'IP', 'SO']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = int(player_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'ERA', 'WHIP', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = float(player_dict[key])
-            result.append(player_dict)
+        for stat in ["W", "K", "SVH"]:
+            player_stat = stat if stat != "K" else "SO"
+            if gaps[stat] > 0:
+                terms.append(f'COALESCE({player_stat}, 0) / ?')
+                params.append(float(gaps[stat]))
         
-        return result
+        # ERA and WHIP (lower is better), weighted by IP
+        for stat in ["ERA", "WHIP"]:
+            if gaps[stat] > 0:
+                terms.append(f'''
+                    CASE WHEN COALESCE(IP, 0) > 0
+                        THEN (? - COALESCE({stat}, 0)) * IP
+                        ELSE 0 END / ?
+                ''')
+                params.extend([float(team_stats[stat]), float(gaps[stat])])
+        
+        # Pitchers have no Role column, so calculate_sg_values applies no multiplier
+        multiplier = '1.0'
+    
+    # Terms are added in the same order as calculate_sg_values so the results match
+    sg_expression = ' + '.join(['0.0'] + [f'({term})' for term in terms])
+    
+    db.execute(f'''
+        UPDATE {table}
+        SET SGCalc = ({sg_expression}) * ({multiplier})
+        WHERE SGCalc IS NULL AND Status = 'FA'
+        AND ({team_column} IS NULL OR {team_column} != ?)
+    ''', params + [team_id])
+
+def get_top_players_by_sg(db, is_hitter, limit=25):
+    """Get the top players by SGCalc value."""
+    # Columns are cast in the SELECT, so the rows already have proper types.
+    # SGCalc is table-qualified so the filter and sort use the column (and its index), not the cast alias.
+    if is_hitter:
+        return query_dicts(db, f'''
+            SELECT {HITTER_SELECT_COLUMNS} FROM Hitters
+            WHERE Hitters.SGCalc IS NOT NULL AND Status = 'FA'
+            ORDER BY Hitters.SGCalc DESC
+            LIMIT ?
+        ''', (limit,))
+    else:
+        return query_dicts(db, f'''
+            SELECT {PITCHER_SELECT_COLUMNS} FROM Pitchers
+            WHERE Pitchers.SGCalc IS NOT NULL AND Status = 'FA'
+            ORDER BY Pitchers.SGCalc DESC
+            LIMIT ?
+        ''', (limit,))
+
+def get_top_hitters_and_pitchers_by_sg(db, limit=25):
+    """Get the top hitters and the top pitchers by SGCalc value with a single query.
+    
+    Returns:
+        tuple: (hitters, pitchers), each a list of player dicts as returned by get_top_players_by_sg
+    """
+    # Each side is a subquery so it keeps its own LIMIT; the outer ORDER BY keeps
+    # each list sorted, since a compound SELECT doesn't preserve subquery order
+    players = db.execute(f'''
+        SELECT * FROM (
+            SELECT 'hitter' AS PlayerType, {HITTER_UNION_COLUMNS} FROM Hitters
+            WHERE Hitters.SGCalc IS NOT NULL AND Status = 'FA'
+            ORDER BY Hitters.SGCalc DESC
+            LIMIT ?
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT 'pitcher' AS PlayerType, {PITCHER_UNION_COLUMNS} FROM Pitchers
+            WHERE Pitchers.SGCalc IS NOT NULL AND Status = 'FA'
+            ORDER BY Pitchers.SGCalc DESC
+            LIMIT ?
+        )
+        ORDER BY PlayerType, SGCalc DESC
+    ''', (limit, limit)).fetchall()
+    
+    hitters = []
+    pitchers = []
+    for player in players:
+        if player[0] == 'hitter':
+            hitters.append(dict(zip(HITTER_COLUMNS, HITTER_UNION_VALUES(player))))
+        else:
+            pitchers.append(dict(zip(PITCHER_COLUMNS, PITCHER_UNION_VALUES(player))))
+    
+    return hitters, pitchers
 
 @bp.route('/top-hitters', methods=['GET'])
 def get_top_hitters():
@@ -1788,7 +1975,7 @@ def get_top_hitters():
         model_id = request.args.get('model_id', default=1, type=int)
         
         # Get top hitters
-        hitters = get_top_players_by_sg(is_hitter=True, limit=limit)
+        hitters = get_top_players_by_sg(get_db(), is_hitter=True, limit=limit)
         
         # Return response
         result = {
@@ -1812,7 +1999,7 @@ def get_top_pitchers():
         model_id = request.args.get('model_id', default=1, type=int)
         
         # Get top pitchers
-        pitchers = get_top_players_by_sg(is_hitter=False, limit=limit)
+        pitchers = get_top_players_by_sg(get_db(), is_hitter=False, limit=limit)
         
         # Return response
         result = {
@@ -1836,8 +2023,7 @@ def get_top_players():
         model_id = request.args.get('model_id', default=1, type=int)
         
         # Get top hitters and pitchers
-        hitters = get_top_players_by_sg(is_hitter=True, limit=limit)
-        pitchers = get_top_players_by_sg(is_hitter=False, limit=limit)
+        hitters, pitchers = get_top_hitters_and_pitchers_by_sg(get_db(), limit=limit)
         
         # Return response
         result = {
@@ -1857,27 +2043,13 @@ def get_hitter_stats(player_id):
     try:
         db = get_db()
         
-        # Get hitter data
-        hitter = db.execute('''
-            SELECT * FROM Hitters
-            WHERE HittingPlayerId = ?
-        ''', (player_id,)).fetchone()
+        # Get hitter data, with numeric columns cast to their proper types by SQLite
+        hitter = db.execute(SQL_GET_HITTER_STATS, (player_id,)).fetchone()
         
         if not hitter:
             return jsonify({'error': f'Hitter with ID {player_id} not found'}), 404
         
-        # Convert to dictionary with proper types
-        hitter_dict = dict(hitter)
-        
-        # Convert numeric fields to appropriate Python types
-        for key in ['Age', 'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB']:
-            if key in hitter_dict and hitter_dict[key] is not None:
-                hitter_dict[key] = int(hitter_dict[key])
-        for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'AVG', 'SGCalc']:
-            if key in hitter_dict and hitter_dict[key] is not None:
-                hitter_dict[key] = float(hitter_dict[key])
-        
-        return jsonify(hitter_dict)
+        return jsonify(dict(hitter))
     except Exception as e:
         current_app.logger.error(f"Error retrieving hitter stats for player with ID {player_id}: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -1888,27 +2060,13 @@ def get_pitcher_stats(player_id):
     try:
         db = get_db()
         
-        # Get pitcher data
-        pitcher = db.execute('''
-            SELECT * FROM Pitchers
-            WHERE PitchingPlayerId = ?
-        ''', (player_id,)).fetchone()
+        # Get pitcher data, with numeric columns cast to their proper types by SQLite
+        pitcher = db.execute(SQL_GET_PITCHER_STATS, (player_id,)).fetchone()
         
         if not pitcher:
             return jsonify({'error': f'Pitcher with ID {player_id} not found'}), 404
         
-        # Convert to dictionary with proper types
-        pitcher_dict = dict(pitcher)
-        
-        # Convert numeric fields to appropriate Python types
-        for key in ['Age', 'W', 'QS', 'G', 'SV', 'HLD', 'SVH', 'IP', 'SO']:
-            if key in pitcher_dict and pitcher_dict[key] is not None:
-                pitcher_dict[key] = int(pitcher_dict[key])
-        for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'ERA', 'WHIP', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc']:
-            if key in pitcher_dict and pitcher_dict[key] is not None:
-                pitcher_dict[key] = float(pitcher_dict[key])
-        
-        return jsonify(pitcher_dict)
+        return jsonify(dict(pitcher))
     except Exception as e:
         current_app.logger.error(f"Error retrieving pitcher stats for player with ID {player_id}: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -1928,7 +2086,12 @@ def generate_optimal_lineup():
         "model_id": int,         # Model ID for standard gains calculation
         "budget": float,         # Total budget constraint (e.g., $100)
         "lineup_type": string,   # "hitting", "pitching", or "both"
-        "bench_positions": int   # Number of bench positions to account for (applies to hitters in "both" mode)
+        "bench_positions": int,  # Number of bench positions to account for (applies to hitters in "both" mode)
+        "sweep": {               # Optional: solve every combination (at most 50) and return the
+                                 # Pareto-best lineups ("pareto_front") instead of a single lineup
+            "bench_positions": [int, ...],
+            "budget": [float, ...]
+        }
     }
     
     Returns:
@@ -1978,50 +2141,19 @@ def generate_optimal_lineup():
         if not team:
             return jsonify({'error': f'No team found with TeamId {team_id}'}), 404
         
+        # Solve a grid of bench/budget settings instead of a single lineup
+        if 'sweep' in data:
+            return sweep_optimal_lineups(db, team_id, model_id, lineup_type, bench_positions, budget, data['sweep'])
+        
         # For "both" option, we'll handle hitters and pitchers separately and then combine the results
         if lineup_type == 'both':
-            # Total bench positions is hardcoded to 3, with the remainder allocated to pitchers
-            TOTAL_BENCH_POSITIONS = 3
+            # The bench positions not used by hitters are allocated to pitchers
             hitter_bench_positions = bench_positions
             pitcher_bench_positions = TOTAL_BENCH_POSITIONS - hitter_bench_positions
             
-            # Determine required positions for hitters
-            hitter_positions = []
-            team_hitters = db.execute('SELECT * FROM TeamHitters WHERE HittingTeamId = ?', (team_id,)).fetchone()
-            
-            if team_hitters:
-                team_hitters_dict = dict(team_hitters)
-                # Find empty positions
-                for position in HITTER_POSITIONS:
-                    if position in team_hitters_dict and not team_hitters_dict[position]:
-                        # Only include bench positions up to the specified number
-                        if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= hitter_bench_positions):
-                            hitter_positions.append(position)
-            else:
-                # If no team hitters record exists, all positions are required
-                # Only include bench positions up to the specified number
-                for position in HITTER_POSITIONS:
-                    if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= hitter_bench_positions):
-                        hitter_positions.append(position)
-            
-            # Determine required positions for pitchers
-            pitcher_positions = []
-            team_pitchers = db.execute('SELECT * FROM TeamPitchers WHERE PitchingTeamId = ?', (team_id,)).fetchone()
-            
-            if team_pitchers:
-                team_pitchers_dict = dict(team_pitchers)
-                # Find empty positions
-                for position in PITCHER_POSITIONS:
-                    if position in team_pitchers_dict and not team_pitchers_dict[position]:
-                        # Only include bench positions up to the specified number
-                        if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= pitcher_bench_positions):
-                            pitcher_positions.append(position)
-            else:
-                # If no team pitchers record exists, all positions are required
-                # Only include bench positions up to the specified number
-                for position in PITCHER_POSITIONS:
-                    if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= pitcher_bench_positions):
-                        pitcher_positions.append(position)
+            # Determine required positions for hitters and pitchers
+            hitter_positions = get_required_positions(db, team_id, 'hitting', hitter_bench_positions)
+            pitcher_positions = get_required_positions(db, team_id, 'pitching', pitcher_bench_positions)
             
             # If no positions need to be filled, return early
             if not hitter_positions and not pitcher_positions:
@@ -2031,139 +2163,98 @@ def generate_optimal_lineup():
                     'optimal_lineup': []
                 })
             
-            # Get available players
-            available_hitters = get_available_hitters(team_id)
-            available_pitchers = get_available_pitchers(team_id)
-            
             # Get team stats and model thresholds for SG calculation
-            team_stats = get_current_team_stats(team_id)
+            team_stats = get_current_team_stats(db, team_id)
             thresholds = get_model_thresholds(model_id)
             gaps = calculate_category_gaps(team_stats, thresholds)
             
-            # Calculate SG values for available hitters
-            for player in available_hitters:
-                sg_value = calculate_sg_value(player, team_stats, gaps, is_hitter=True)
-                if 'SGCalc' not in player or player['SGCalc'] is None:
-                    update_player_sg(player['HittingPlayerId'], sg_value, is_hitter=True)
-                    player['SGCalc'] = sg_value
-            
-            # Calculate SG values for available pitchers
-            for player in available_pitchers:
-                sg_value = calculate_sg_value(player, team_stats, gaps, is_hitter=False)
-                if 'SGCalc' not in player or player['SGCalc'] is None:
-                    update_player_sg(player['PitchingPlayerId'], sg_value, is_hitter=False)
-                    player['SGCalc'] = sg_value
-            
-            # Import PuLP for linear programming
-            import pulp
-            
-            # Create a linear programming problem
-            prob = pulp.LpProblem("OptimalLineup", pulp.LpMaximize)
-            
-            # Create decision variables for each player-position combination
-            player_vars = {}
+            # Calculate and store SG values for available players that don't have one yet
+            update_missing_sg(db, team_id, team_stats, gaps, is_hitter=True)
+            update_missing_sg(db, team_id, team_stats, gaps, is_hitter=False)
+            db.commit()
+            
+            # Get available players, leaving out any that can't be part of an optimal lineup
+            available_hitters, available_pitchers = lineup_players(
+                get_available_hitters(db, team_id),
+                get_available_pitchers(db, team_id),
+                hitter_positions,
+                pitcher_positions
+            )
             
-            # Create variables for each valid hitter-position combination
-            for player in available_hitters:
-                player_id = player['HittingPlayerId']
-                player_position = player['Position']
+            if current_app.config['USE_PULP_SOLVER']:
+                # Create a linear programming problem
+                prob = pulp.LpProblem("OptimalLineup", pulp.LpMaximize)
                 
-                for position in hitter_positions:
-                    # Check if player can play this position
-                    position_requirements = POSITION_MAPPING.get(position, [])
-                    
-                    if player_position in position_requirements:
-                        var_name = f"hitter_{player_id}_pos_{position}"
-                        player_vars[(player_id, position, 'hitting')] = pulp.LpVariable(var_name, 0, 1, pulp.LpBinary)
-            
-            # Create variables for each valid pitcher-position combination
-            for player in available_pitchers:
-                player_id = player['PitchingPlayerId']
+                # Create decision variables for each player-position combination,
+                # kept with the player and position they stand for
+                player_vars = []
                 
-                for position in pitcher_positions:
-                    var_name = f"pitcher_{player_id}_pos_{position}"
-                    player_vars[(player_id, position, 'pitching')] = pulp.LpVariable(var_name, 0, 1, pulp.LpBinary)
-            
-            # Objective function: Maximize total SG value
-            prob += pulp.lpSum([player_vars.get((player['HittingPlayerId'], position, 'hitting'), 0) * player.get('SGCalc', 0) 
-                               for player in available_hitters for position in hitter_positions]) + \
-                   pulp.lpSum([player_vars.get((player['PitchingPlayerId'], position, 'pitching'), 0) * player.get('SGCalc', 0) 
-                               for player in available_pitchers for position in pitcher_positions])
-            
-            # Constraint 1: Budget constraint (combined for both hitters and pitchers)
-            prob += pulp.lpSum([player_vars.get((player['HittingPlayerId'], position, 'hitting'), 0) * player.get('AdjustedSalary', 0) 
-                               for player in available_hitters for position in hitter_positions]) + \
-                   pulp.lpSum([player_vars.get((player['PitchingPlayerId'], position, 'pitching'), 0) * player.get('AdjustedSalary', 0) 
-                               for player in available_pitchers for position in pitcher_positions]) <= budget
-            
-            # Constraint 2: Each hitter position must be filled by exactly one player
-            for position in hitter_positions:
-                prob += pulp.lpSum([player_vars.get((player['HittingPlayerId'], position, 'hitting'), 0) 
-                                   for player in available_hitters]) == 1
-            
-            # Constraint 3: Each pitcher position must be filled by exactly one player
-            for position in pitcher_positions:
-                prob += pulp.lpSum([player_vars.get((player['PitchingPlayerId'], position, 'pitching'), 0) 
-                                   for player in available_pitchers]) == 1
-            
-            # Constraint 4: Each hitter can be assigned to at most one position
-            for player in available_hitters:
-                player_id = player['HittingPlayerId']
-                prob += pulp.lpSum([player_vars.get((player_id, position, 'hitting'), 0) 
-                                   for position in hitter_positions]) <= 1
-            
-            # Constraint 5: Each pitcher can be assigned to at most one position
-            for player in available_pitchers:
-                player_id = player['PitchingPlayerId']
-                prob += pulp.lpSum([player_vars.get((player_id, position, 'pitching'), 0) 
-                                   for position in pitcher_positions]) <= 1
-            
-            # Solve the problem with a timeout
-            solver = pulp.PULP_CBC_CMD(timeLimit=30)  # 30-second timeout
-            prob.solve(solver)
-            
-            # Check if a solution was found
-            if pulp.LpStatus[prob.status] != 'Optimal':
-                return jsonify({
-                    'status': 'error',
-                    'message': f'No optimal solution found. Status: {pulp.LpStatus[prob.status]}',
-                    'hitter_positions': hitter_positions,
-                    'pitcher_positions': pitcher_positions
-                }), 400
-            
-            # Extract the optimal lineup
-            optimal_lineup = []
-            total_cost = 0
-            total_sg_value = 0
-            
-            # Extract hitters
-            for player in available_hitters:
-                player_id = player['HittingPlayerId']
+                # Only the variables that exist go into the objective and constraints, so the
+                # model is built in one pass over the eligible pairs. The objective and budget
+                # are built from (variable, coefficient) pairs without per-term expressions.
+                sg_terms = []
+                salary_terms = []
+                position_terms = defaultdict(list)
+                player_terms = defaultdict(list)
+                
+                # Create variables for each valid hitter-position and pitcher-position combination
+                for player, player_id, position, player_type in lineup_candidates(
+                    available_hitters, available_pitchers, hitter_positions, pitcher_positions
+                ):
+                    var_name = f"{'hitter' if player_type == 'hitting' else 'pitcher'}_{player_id}_pos_{position}"
+                    var = pulp.LpVariable(var_name, 0, 1, pulp.LpBinary)
+                    player_vars.append((var, player, player_id, position, player_type))
+                    sg_terms.append((var, player.get('SGCalc', 0)))
+                    salary_terms.append((var, player.get('AdjustedSalary', 0)))
+                    position_terms[(position, player_type)].append(var)
+                    player_terms[(player_id, player_type)].append(var)
+                
+                # Objective function: Maximize total SG value
+                prob += pulp.LpAffineExpression(sg_terms)
+                
+                # Constraint 1: Budget constraint (combined for both hitters and pitchers)
+                prob += pulp.LpAffineExpression(salary_terms) <= budget
+                
+                # Constraint 2: Each hitter position must be filled by exactly one player
                 for position in hitter_positions:
-                    var = player_vars.get((player_id, position, 'hitting'))
-                    if var and var.value() == 1:
-                        player_salary = player.get('AdjustedSalary', 0)
-                        player_sg = player.get('SGCalc', 0)
-                        
-                        optimal_lineup.append({
-                            'player_id': player_id,
-                            'name': player.get('PlayerName', 'Unknown'),
-                            'position': position,
-                            'original_position': player.get('Position', 'Unknown'),
-                            'salary': player_salary,
-                            'sg_value': player_sg,
-                            'type': 'hitting'
-                        })
-                        
-                        total_cost += player_salary
-                        total_sg_value += player_sg
-            
-            # Extract pitchers
-            for player in available_pitchers:
-                player_id = player['PitchingPlayerId']
+                    prob += pulp.lpSum(position_terms[(position, 'hitting')]) == 1
+                
+                # Constraint 3: Each pitcher position must be filled by exactly one player
                 for position in pitcher_positions:
-                    var = player_vars.get((player_id, position, 'pitching'))
-                    if var and var.value() == 1:
+                    prob += pulp.lpSum(position_terms[(position, 'pitching')]) == 1
+                
+                # Constraints 4 and 5: Each hitter and each pitcher can be assigned to at most one position
+                for terms in player_terms.values():
+                    prob += pulp.lpSum(terms) <= 1
+                
+                # Start CBC from the team's previous lineup when it is still a feasible lineup here
+                lineup_vars = [entry[0] for entry in player_vars]
+                warm_start = apply_lineup_warm_start(team_id, 'both', prob, lineup_vars)
+                
+                # Solve the problem with a timeout
+                solver = lineup_cbc_solver(warm_start=warm_start)
+                prob.solve(solver)
+                
+                # Check if a solution was found
+                if pulp.LpStatus[prob.status] != 'Optimal':
+                    return jsonify({
+                        'status': 'error',
+                        'message': f'No optimal solution found. Status: {pulp.LpStatus[prob.status]}',
+                        'hitter_positions': hitter_positions,
+                        'pitcher_positions': pitcher_positions
+                    }), 400
+                
+                store_lineup_warm_start(team_id, 'both', lineup_vars)
+                
+                # Extract the optimal lineup
+                optimal_lineup = []
+                total_cost = 0
+                total_sg_value = 0
+                optimized_ids = {'hitting': [], 'pitching': []}
+                
+                # Only the chosen variables are read back, in the order they were created
+                for var, player, player_id, position, player_type in player_vars:
+                    if var.varValue is not None and var.varValue > 0.5:
                         player_salary = player.get('AdjustedSalary', 0)
                         player_sg = player.get('SGCalc', 0)
                         
@@ -2174,39 +2265,38 @@ def generate_optimal_lineup():
                             'original_position': player.get('Position', 'Unknown'),
                             'salary': player_salary,
                             'sg_value': player_sg,
-                            'type': 'pitching'
+                            'type': player_type
                         })
                         
                         total_cost += player_salary
                         total_sg_value += player_sg
+                        optimized_ids[player_type].append(player_id)
+            else:
+                # One candidate per eligible player-position combination
+                candidates = lineup_candidates(available_hitters, available_pitchers, hitter_positions, pitcher_positions)
+                selected, solver_status = solve_lineup_candidates(candidates, hitter_positions, pitcher_positions, budget)
+                
+                # Check if a solution was found
+                if selected is None:
+                    return jsonify({
+                        'status': 'error',
+                        'message': f'No optimal solution found. Status: {solver_status}',
+                        'hitter_positions': hitter_positions,
+                        'pitcher_positions': pitcher_positions
+                    }), 400
+                
+                # Extract the optimal lineup
+                optimal_lineup, total_cost, total_sg_value, optimized_ids = build_lineup(candidates, selected)
             
             # Sort the lineup by position type (hitters first, then pitchers) and then by position
-            hitter_position_order = {pos: idx for idx, pos in enumerate(HITTER_POSITIONS)}
-            pitcher_position_order = {pos: idx for idx, pos in enumerate(PITCHER_POSITIONS)}
-            
-            def sort_key(player):
-                if player['type'] == 'hitting':
-                    return (0, hitter_position_order.get(player['position'], 999))
-                else:
-                    return (1, pitcher_position_order.get(player['position'], 999))
-            
-            optimal_lineup.sort(key=sort_key)
+            optimal_lineup.sort(key=lineup_sort_key)
             
-            # Extract player IDs from the optimal lineup for stats calculation
-            optimized_hitter_ids = []
-            optimized_pitcher_ids = []
-            
-            for player in optimal_lineup:
-                if player['type'] == 'hitting':
-                    optimized_hitter_ids.append(player['player_id'])
-                elif player['type'] == 'pitching':
-                    optimized_pitcher_ids.append(player['player_id'])
-            
-            # Calculate optimized stats
+            # Calculate optimized stats from the player IDs collected during extraction
             optimized_stats = calculate_optimized_team_stats(
+                db,
                 team_id, 
-                optimized_hitters=optimized_hitter_ids,
-                optimized_pitchers=optimized_pitcher_ids
+                optimized_hitters=optimized_ids['hitting'],
+                optimized_pitchers=optimized_ids['pitching']
             )
             
             return jsonify({
@@ -2223,45 +2313,7 @@ def generate_optimal_lineup():
         
         # Original implementation for 'hitting' or 'pitching' only
         # Determine required positions based on lineup_type
-        required_positions = []
-        
-        if lineup_type == 'hitting':
-            # Get current hitter positions
-            team_hitters = db.execute('SELECT * FROM TeamHitters WHERE HittingTeamId = ?', (team_id,)).fetchone()
-            
-            if team_hitters:
-                team_hitters_dict = dict(team_hitters)
-                # Find empty positions
-                for position in HITTER_POSITIONS:
-                    if position in team_hitters_dict and not team_hitters_dict[position]:
-                        # Only include bench positions up to the specified number
-                        if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                            required_positions.append(position)
-            else:
-                # If no team hitters record exists, all positions are required
-                # Only include bench positions up to the specified number
-                for position in HITTER_POSITIONS:
-                    if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                        required_positions.append(position)
-        
-        else:  # lineup_type == 'pitching'
-            # Get current pitcher positions
-            team_pitchers = db.execute('SELECT * FROM TeamPitchers WHERE PitchingTeamId = ?', (team_id,)).fetchone()
-            
-            if team_pitchers:
-                team_pitchers_dict = dict(team_pitchers)
-                # Find empty positions
-                for position in PITCHER_POSITIONS:
-                    if position in team_pitchers_dict and not team_pitchers_dict[position]:
-                        # Only include bench positions up to the specified number
-                        if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                            required_positions.append(position)
-            else:
-                # If no team pitchers record exists, all positions are required
-                # Only include bench positions up to the specified number
-                for position in PITCHER_POSITIONS:
-                    if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                        required_positions.append(position)
+        required_positions = get_required_positions(db, team_id, lineup_type, bench_positions)
         
         # If no positions need to be filled, return early
         if not required_positions:
@@ -2271,105 +2323,95 @@ def generate_optimal_lineup():
                 'optimal_lineup': []
             })
         
-        # Get available players based on lineup_type
-        available_players = []
-        if lineup_type == 'hitting':
-            # Get available hitters
-            available_players = get_available_hitters(team_id)
-        else:  # lineup_type == 'pitching'
-            # Get available pitchers
-            available_players = get_available_pitchers(team_id)
-        
         # Get team stats and model thresholds for SG calculation
-        team_stats = get_current_team_stats(team_id)
+        team_stats = get_current_team_stats(db, team_id)
         thresholds = get_model_thresholds(model_id)
         gaps = calculate_category_gaps(team_stats, thresholds)
         
-        # Calculate SG values for available players
-        for player in available_players:
-            is_hitter = lineup_type == 'hitting'
-            sg_value = calculate_sg_value(player, team_stats, gaps, is_hitter=is_hitter)
-            
-            # Add SG value to player dict if not already present
-            if is_hitter:
-                player_id_key = 'HittingPlayerId'
-                if 'SGCalc' not in player or player['SGCalc'] is None:
-                    update_player_sg(player[player_id_key], sg_value, is_hitter=True)
-                    player['SGCalc'] = sg_value
-            else:
-                player_id_key = 'PitchingPlayerId'
-                if 'SGCalc' not in player or player['SGCalc'] is None:
-                    update_player_sg(player[player_id_key], sg_value, is_hitter=False)
-                    player['SGCalc'] = sg_value
-        
-        # Import PuLP for linear programming
-        import pulp
-        
-        # Create a linear programming problem
-        prob = pulp.LpProblem("OptimalLineup", pulp.LpMaximize)
-        
-        # Create decision variables for each player-position combination
-        # 1 if player i is assigned to position j, 0 otherwise
-        player_vars = {}
+        # Calculate and store SG values for available players that don't have one yet
+        is_hitter = lineup_type == 'hitting'
+        update_missing_sg(db, team_id, team_stats, gaps, is_hitter=is_hitter)
+        db.commit()
         
-        # Determine player ID key based on lineup type
-        player_id_key = 'HittingPlayerId' if lineup_type == 'hitting' else 'PitchingPlayerId'
+        # Get available players based on lineup_type, leaving out any that can't be part
+        # of an optimal lineup, and list every eligible player-position combination
+        hitter_positions = required_positions if is_hitter else []
+        pitcher_positions = [] if is_hitter else required_positions
+        hitters, pitchers = lineup_players(
+            get_available_hitters(db, team_id) if is_hitter else [],
+            [] if is_hitter else get_available_pitchers(db, team_id),
+            hitter_positions,
+            pitcher_positions
+        )
+        candidates = lineup_candidates(hitters, pitchers, hitter_positions, pitcher_positions)
         
-        # Create variables for each valid player-position combination
-        for player in available_players:
-            player_id = player[player_id_key]
-            player_position = player['Position']
+        if current_app.config['USE_PULP_SOLVER']:
+            # Create a linear programming problem
+            prob = pulp.LpProblem("OptimalLineup", pulp.LpMaximize)
             
+            # Create decision variables for each player-position combination
+            # 1 if player i is assigned to position j, 0 otherwise
+            player_vars = []
+            
+            # Only the variables that exist go into the objective and constraints, so the
+            # model is built in one pass over the eligible pairs. The objective and budget
+            # are built from (variable, coefficient) pairs without per-term expressions.
+            sg_terms = []
+            salary_terms = []
+            position_terms = defaultdict(list)
+            player_terms = defaultdict(list)
+            
+            # Create variables for each valid player-position combination
+            for player, player_id, position, _ in candidates:
+                var_name = f"player_{player_id}_pos_{position}"
+                var = pulp.LpVariable(var_name, 0, 1, pulp.LpBinary)
+                player_vars.append((var, player, player_id, position))
+                sg_terms.append((var, player.get('SGCalc', 0)))
+                salary_terms.append((var, player.get('AdjustedSalary', 0)))
+                position_terms[position].append(var)
+                player_terms[player_id].append(var)
+            
+            # Objective function: Maximize total SG value
+            prob += pulp.LpAffineExpression(sg_terms)
+            
+            # Constraint 1: Budget constraint
+            prob += pulp.LpAffineExpression(salary_terms) <= budget
+            
+            # Constraint 2: Each position must be filled by exactly one player
             for position in required_positions:
-                # Check if player can play this position
-                position_requirements = POSITION_MAPPING.get(position, [])
-                
-                # For pitchers, all pitchers can play any pitcher position
-                if lineup_type == 'pitching' or player_position in position_requirements:
-                    var_name = f"player_{player_id}_pos_{position}"
-                    player_vars[(player_id, position)] = pulp.LpVariable(var_name, 0, 1, pulp.LpBinary)
-        
-        # Objective function: Maximize total SG value
-        prob += pulp.lpSum([player_vars.get((player[player_id_key], position), 0) * player.get('SGCalc', 0) 
-                           for player in available_players for position in required_positions])
-        
-        # Constraint 1: Budget constraint
-        prob += pulp.lpSum([player_vars.get((player[player_id_key], position), 0) * player.get('AdjustedSalary', 0) 
-                           for player in available_players for position in required_positions]) <= budget
-        
-        # Constraint 2: Each position must be filled by exactly one player
-        for position in required_positions:
-            prob += pulp.lpSum([player_vars.get((player[player_id_key], position), 0) 
-                               for player in available_players]) == 1
-        
-        # Constraint 3: Each player can be assigned to at most one position
-        for player in available_players:
-            player_id = player[player_id_key]
-            prob += pulp.lpSum([player_vars.get((player_id, position), 0) 
-                               for position in required_positions]) <= 1
-        
-        # Solve the problem with a timeout
-        solver = pulp.PULP_CBC_CMD(timeLimit=30)  # 30-second timeout
-        prob.solve(solver)
-        
-        # Check if a solution was found
-        if pulp.LpStatus[prob.status] != 'Optimal':
-            return jsonify({
-                'status': 'error',
-                'message': f'No optimal solution found. Status: {pulp.LpStatus[prob.status]}',
-                'required_positions': required_positions
-            }), 400
-        
-        # Extract the optimal lineup
-        optimal_lineup = []
-        total_cost = 0
-        total_sg_value = 0
-        
-        for player in available_players:
-            player_id = player[player_id_key]
-            for position in required_positions:
-                var = player_vars.get((player_id, position))
-                if var and var.value() == 1:
+                prob += pulp.lpSum(position_terms[position]) == 1
+            
+            # Constraint 3: Each player can be assigned to at most one position
+            for terms in player_terms.values():
+                prob += pulp.lpSum(terms) <= 1
+            
+            # Start CBC from the team's previous lineup when it is still a feasible lineup here
+            lineup_vars = [entry[0] for entry in player_vars]
+            warm_start = apply_lineup_warm_start(team_id, lineup_type, prob, lineup_vars)
+            
+            # Solve the problem with a timeout
+            solver = lineup_cbc_solver(warm_start=warm_start)
+            prob.solve(solver)
+            
+            # Check if a solution was found
+            if pulp.LpStatus[prob.status] != 'Optimal':
+                return jsonify({
+                    'status': 'error',
+                    'message': f'No optimal solution found. Status: {pulp.LpStatus[prob.status]}',
+                    'required_positions': required_positions
+                }), 400
+            
+            store_lineup_warm_start(team_id, lineup_type, lineup_vars)
+            
+            # Extract the optimal lineup
+            optimal_lineup = []
+            total_cost = 0
+            total_sg_value = 0
+            optimized_ids = []
+            
+            # Only the chosen variables are read back, in the order they were created
+            for var, player, player_id, position in player_vars:
+                if var.varValue is not None and var.varValue > 0.5:
                     player_salary = player.get('AdjustedSalary', 0)
                     player_sg = player.get('SGCalc', 0)
                     
@@ -2385,32 +2427,34 @@ def generate_optimal_lineup():
                     
                     total_cost += player_salary
                     total_sg_value += player_sg
+                    optimized_ids.append(player_id)
+        else:
+            selected, solver_status = solve_lineup_candidates(candidates, hitter_positions, pitcher_positions, budget)
+            
+            # Check if a solution was found
+            if selected is None:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'No optimal solution found. Status: {solver_status}',
+                    'required_positions': required_positions
+                }), 400
+            
+            # Extract the optimal lineup
+            optimal_lineup, total_cost, total_sg_value, lineup_ids = build_lineup(candidates, selected)
+            optimized_ids = lineup_ids[lineup_type]
         
         # Sort the lineup by position
-        if lineup_type == 'hitting':
-            position_order = {pos: idx for idx, pos in enumerate(HITTER_POSITIONS)}
-        else:
-            position_order = {pos: idx for idx, pos in enumerate(PITCHER_POSITIONS)}
+        position_order = HITTER_POSITION_ORDER if lineup_type == 'hitting' else PITCHER_POSITION_ORDER
         
         optimal_lineup.sort(key=lambda x: position_order.get(x['position'], 999))
         
-        # Extract player IDs from the optimal lineup for stats calculation
-        optimized_hitter_ids = []
-        optimized_pitcher_ids = []
-        
-        for player in optimal_lineup:
-            if player['type'] == 'hitting':
-                optimized_hitter_ids.append(player['player_id'])
-            elif player['type'] == 'pitching':
-                optimized_pitcher_ids.append(player['player_id'])
-        
-        # Calculate optimized stats
+        # Calculate optimized stats from the player IDs collected during extraction
         optimized_stats = calculate_optimized_team_stats(
+            db,
             team_id, 
-            optimized_hitters=optimized_hitter_ids if lineup_type in ['hitting', 'both'] else None,
-            optimized_pitchers=optimized_pitcher_ids if lineup_type in ['pitching', 'both'] else None
+            optimized_hitters=optimized_ids if lineup_type == 'hitting' else None,
+            optimized_pitchers=optimized_ids if lineup_type == 'pitching' else None
         )
-        print("OPTIMIZSED_STATS", optimized_stats)
         return jsonify({
             'status': 'success',
             'message': 'Optimal lineup generated successfully.',
@@ -2426,49 +2470,502 @@ def generate_optimal_lineup():
         current_app.logger.error(f"Error generating optimal lineup: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# Largest number of bench/budget combinations a single sweep request may solve
+MAX_SWEEP_COMBINATIONS = 50
+
+def sweep_optimal_lineups(db, team_id, model_id, lineup_type, bench_positions, budget, sweep):
+    """Generate optimal lineups for every bench/budget combination.
+    
+    A bigger budget or bench never lowers the best SG total, so there is no
+    single best combination. Instead the lineups on the Pareto front are
+    returned: those that no other combination beats on both total SG value
+    (higher) and total cost (lower). Available players and SG values are loaded
+    once and each combination is then solved in turn. Sweeps are limited to
+    MAX_SWEEP_COMBINATIONS.
+    
+    Args:
+        db (sqlite3.Connection): The request's database connection
+        team_id (int): Team ID
+        model_id (int): Model ID for standard gains calculation
+        lineup_type (str): "hitting", "pitching", or "both"
+        bench_positions (int): Bench positions used when the sweep doesn't list any
+        budget (float): Budget used when the sweep doesn't list any
+        sweep (dict): Lists of "bench_positions" and/or "budget" values to try
+        
+    Returns:
+        Response: The Pareto-front lineups by increasing cost, plus a summary of every combination
+    """
+    if not isinstance(sweep, dict):
+        return jsonify({'error': 'sweep must be an object with "bench_positions" and/or "budget" lists'}), 400
+    
+    bench_values = sweep.get('bench_positions', [bench_positions])
+    budget_values = sweep.get('budget', [budget])
+    if not isinstance(bench_values, list) or not isinstance(budget_values, list) or not bench_values or not budget_values:
+        return jsonify({'error': 'sweep values must be non-empty lists'}), 400
+    
+    try:
+        bench_values = [int(value) for value in bench_values]
+        budget_values = [float(value) for value in budget_values]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'sweep bench_positions must be integers and budget values must be numbers'}), 400
+    
+    if any(not 0 <= bench <= TOTAL_BENCH_POSITIONS for bench in bench_values):
+        return jsonify({'error': f'sweep bench_positions must be between 0 and {TOTAL_BENCH_POSITIONS}'}), 400
+    
+    if len(bench_values) * len(budget_values) > MAX_SWEEP_COMBINATIONS:
+        return jsonify({'error': f'sweep can try at most {MAX_SWEEP_COMBINATIONS} bench/budget combinations'}), 400
+    
+    # Get team stats and model thresholds for SG calculation
+    team_stats = get_current_team_stats(db, team_id)
+    thresholds = get_model_thresholds(model_id)
+    gaps = calculate_category_gaps(team_stats, thresholds)
+    
+    # Calculate and store SG values for available players that don't have one yet
+    if lineup_type in ['hitting', 'both']:
+        update_missing_sg(db, team_id, team_stats, gaps, is_hitter=True)
+    if lineup_type in ['pitching', 'both']:
+        update_missing_sg(db, team_id, team_stats, gaps, is_hitter=False)
+    db.commit()
+    
+    available_hitters = get_available_hitters(db, team_id) if lineup_type in ['hitting', 'both'] else []
+    available_pitchers = get_available_pitchers(db, team_id) if lineup_type in ['pitching', 'both'] else []
+    
+    # Solve every combination; the candidates only depend on the bench setting
+    results = []
+    lineups = []
+    for bench in bench_values:
+        # The bench positions not used by hitters are allocated to pitchers in a "both" lineup
+        hitter_positions = []
+        pitcher_positions = []
+        if lineup_type in ['hitting', 'both']:
+            hitter_positions = get_required_positions(db, team_id, 'hitting', bench)
+        if lineup_type == 'pitching':
+            pitcher_positions = get_required_positions(db, team_id, 'pitching', bench)
+        elif lineup_type == 'both':
+            pitcher_positions = get_required_positions(db, team_id, 'pitching', TOTAL_BENCH_POSITIONS - bench)
+        
+        hitters, pitchers = lineup_players(available_hitters, available_pitchers, hitter_positions, pitcher_positions)
+        candidates = lineup_candidates(hitters, pitchers, hitter_positions, pitcher_positions)
+        
+        for sweep_budget in budget_values:
+            selected, solver_status = solve_lineup_candidates(candidates, hitter_positions, pitcher_positions, sweep_budget)
+            result = {
+                'bench_positions': bench,
+                'budget': sweep_budget,
+                'status': solver_status
+            }
+            results.append(result)
+            
+            if selected is None:
+                continue
+            
+            optimal_lineup, total_cost, total_sg_value, optimized_ids = build_lineup(candidates, selected)
+            result['total_cost'] = total_cost
+            result['total_sg_value'] = total_sg_value
+            lineups.append((result, optimal_lineup, optimized_ids, hitter_positions, pitcher_positions))
+    
+    if not lineups:
+        return jsonify({
+            'status': 'error',
+            'message': 'No optimal solution found for any sweep combination.',
+            'sweep_results': results
+        }), 400
+    
+    # Walking the lineups by increasing cost (and decreasing SG value for equal cost),
+    # a lineup is on the Pareto front if it beats the SG value of every cheaper one
+    pareto_front = []
+    best_sg_value = None
+    for result, optimal_lineup, optimized_ids, hitter_positions, pitcher_positions in sorted(
+        lineups, key=lambda lineup: (lineup[0]['total_cost'], -lineup[0]['total_sg_value'])
+    ):
+        if best_sg_value is not None and result['total_sg_value'] <= best_sg_value:
+            continue
+        best_sg_value = result['total_sg_value']
+        
+        optimal_lineup.sort(key=lineup_sort_key)
+        
+        # Calculate optimized stats from the player IDs collected while building the lineup
+        optimized_stats = calculate_optimized_team_stats(
+            db,
+            team_id,
+            optimized_hitters=optimized_ids['hitting'] if lineup_type in ['hitting', 'both'] else None,
+            optimized_pitchers=optimized_ids['pitching'] if lineup_type in ['pitching', 'both'] else None
+        )
+        
+        pareto_front.append({
+            **result,
+            'optimal_lineup': optimal_lineup,
+            'hitter_positions': hitter_positions,
+            'pitcher_positions': pitcher_positions,
+            'optimized_hitting_stats': optimized_stats['optimized_hitting_stats'] if lineup_type in ['hitting', 'both'] else {},
+            'optimized_pitching_stats': optimized_stats['optimized_pitching_stats'] if lineup_type in ['pitching', 'both'] else {}
+        })
+    
+    return jsonify({
+        'status': 'success',
+        'message': 'Optimal lineup sweep completed successfully.',
+        'pareto_front': pareto_front,
+        'sweep_results': results
+    })
+
+def lineup_players(available_hitters, available_pitchers, hitter_positions, pitcher_positions):
+    """Leave out the available players that can't be part of an optimal lineup.
+    
+    Args:
+        available_hitters (list): Available hitter dicts
+        available_pitchers (list): Available pitcher dicts
+        hitter_positions (list): Open hitter positions
+        pitcher_positions (list): Open pitcher positions
+        
+    Returns:
+        tuple: (hitters, pitchers) worth modeling, in their original order
+    """
+    # Hitters only fill the open positions they are eligible for; any pitcher can fill any pitcher position
+    hitter_position_set = set(hitter_positions)
+    hitters = drop_dominated_players(available_hitters, [
+        tuple(position for position in POSITIONS_BY_PLAYING_POSITION.get(player['Position'], ()) if position in hitter_position_set)
+        for player in available_hitters
+    ])
+    pitchers = drop_dominated_players(available_pitchers, [tuple(pitcher_positions)] * len(available_pitchers))
+    
+    return hitters, pitchers
+
+def lineup_candidates(hitters, pitchers, hitter_positions, pitcher_positions):
+    """List one candidate per eligible player-position combination.
+    
+    Returns:
+        list: (player, player_id, position, player_type) tuples, hitters first
+    """
+    candidates = []
+    hitter_position_set = set(hitter_positions)
+    for player in hitters:
+        # Only visit the roster positions this player is eligible for
+        for position in POSITIONS_BY_PLAYING_POSITION.get(player['Position'], ()):
+            if position in hitter_position_set:
+                candidates.append((player, player['HittingPlayerId'], position, 'hitting'))
+    
+    # All pitchers can play any pitcher position
+    for player in pitchers:
+        for position in pitcher_positions:
+            candidates.append((player, player['PitchingPlayerId'], position, 'pitching'))
+    
+    return candidates
+
+def solve_lineup_candidates(candidates, hitter_positions, pitcher_positions, budget):
+    """Pick the candidates that make up the lineup with the highest total SG value.
+    
+    Hitters and pitchers share bench position names and may share IDs, so both
+    are keyed by lineup type as well.
+    
+    Returns:
+        tuple: (indices of the selected candidates, solver status name), as returned by solve_lineup
+    """
+    return solve_lineup(
+        [((player_type, player_id), (player_type, position), player.get('SGCalc', 0), player.get('AdjustedSalary', 0))
+         for player, player_id, position, player_type in candidates],
+        [('hitting', position) for position in hitter_positions] +
+        [('pitching', position) for position in pitcher_positions],
+        budget
+    )
+
+def build_lineup(candidates, selected):
+    """Build the lineup response entries for the selected candidates.
+    
+    Returns:
+        tuple: (lineup entries in selection order, total cost, total SG value,
+            dict of the selected player IDs by lineup type)
+    """
+    optimal_lineup = []
+    total_cost = 0
+    total_sg_value = 0
+    optimized_ids = {'hitting': [], 'pitching': []}
+    
+    for index in selected:
+        player, player_id, position, player_type = candidates[index]
+        player_salary = player.get('AdjustedSalary', 0)
+        player_sg = player.get('SGCalc', 0)
+        
+        optimal_lineup.append({
+            'player_id': player_id,
+            'name': player.get('PlayerName', 'Unknown'),
+            'position': position,
+            'original_position': player.get('Position', 'Unknown'),
+            'salary': player_salary,
+            'sg_value': player_sg,
+            'type': player_type
+        })
+        
+        total_cost += player_salary
+        total_sg_value += player_sg
+        optimized_ids[player_type].append(player_id)
+    
+    return optimal_lineup, total_cost, total_sg_value, optimized_ids
+
+def solve_lineup(candidates, positions, budget, time_limit=30):
+    """Pick the lineup with the highest total SG value.
+    
+    Without the budget the lineup is a plain assignment of players to positions,
+    which linear_sum_assignment solves directly. If that lineup already fits the
+    budget it is optimal for the budgeted problem too; otherwise the budget is
+    binding and the full MILP is solved.
+    
+    Args:
+        candidates (list): (player_key, position_key, sg_value, salary) tuples, one per
+            eligible player-position pair
+        positions (list): Position keys that must each be filled by exactly one player
+        budget (float): Maximum total salary
+        time_limit (int): Solver timeout in seconds for the MILP
+        
+    Returns:
+        tuple: (indices of the selected candidates, solver status name). The indices
+            are None if no optimal solution was found.
+    """
+    selected = solve_lineup_assignment(candidates, positions, budget)
+    if selected is not None:
+        return selected, MILP_STATUS_NAMES[0]
+    
+    return solve_lineup_milp(candidates, positions, budget, time_limit=time_limit)
+
+def solve_lineup_assignment(candidates, positions, budget):
+    """Solve the lineup as an assignment problem, ignoring the budget.
+    
+    Returns:
+        list: Indices of the selected candidates, or None if no assignment fills
+            every position or the best assignment is over budget
+    """
+    if not candidates:
+        return None
+    
+    position_index = {position: index for index, position in enumerate(positions)}
+    player_index = {}
+    for player_key, _, _, _ in candidates:
+        player_index.setdefault(player_key, len(player_index))
+    
+    # One row per position and one column per player; ineligible pairs can't be assigned
+    costs = np.full((len(positions), len(player_index)), np.inf)
+    candidate_index = np.full(costs.shape, -1, dtype=np.int64)
+    for index, (player_key, position_key, sg_value, _) in enumerate(candidates):
+        row, column = position_index[position_key], player_index[player_key]
+        costs[row, column] = -sg_value
+        candidate_index[row, column] = index
+    
+    try:
+        rows, columns = linear_sum_assignment(costs)
+    except ValueError:
+        # Some position can't be filled
+        return None
+    
+    selected = sorted(candidate_index[rows, columns].tolist())
+    if len(selected) < len(positions) or sum(candidates[index][3] for index in selected) > budget:
+        return None
+    
+    return selected
+
+def drop_dominated_players(players, eligible_positions):
+    """Remove players that can never be needed in an optimal lineup.
+    
+    Players are grouped by the exact set of open positions they can fill. Within
+    a group that can fill K positions, a player with at least K other players in
+    the group that are at least as valuable (SG) and at least as cheap (salary)
+    can always be swapped for one of them, so it is left out of the model. Ties
+    are broken by list order so identical players are not all dropped.
+    
+    Args:
+        players (list): Player dicts with SGCalc and AdjustedSalary
+        eligible_positions (list): For each player, a tuple of the open positions it can fill
+        
+    Returns:
+        list: The players worth modeling, in their original order
+    """
+    groups = defaultdict(list)
+    for index, positions in enumerate(eligible_positions):
+        if positions:
+            groups[positions].append(index)
+    
+    keep = []
+    for positions, indexes in groups.items():
+        if len(indexes) <= len(positions):
+            keep.extend(indexes)
+            continue
+        
+        sg_values = np.array([players[index].get('SGCalc', 0) for index in indexes], dtype=np.float64)
+        salaries = np.array([players[index].get('AdjustedSalary', 0) for index in indexes], dtype=np.float64)
+        order = np.arange(len(indexes))
+        
+        # dominates[d, p] is True if player d is at least as good as player p in both respects
+        # and strictly better in one (or earlier in the list when they are equal)
+        dominates = (
+            (sg_values[:, None] >= sg_values[None, :]) & (salaries[:, None] <= salaries[None, :]) &
+            ((sg_values[:, None] > sg_values[None, :]) | (salaries[:, None] < salaries[None, :]) | (order[:, None] < order[None, :]))
+        )
+        dominator_counts = dominates.sum(axis=0)
+        keep.extend(index for index, count in zip(indexes, dominator_counts.tolist()) if count < len(positions))
+    
+    return [players[index] for index in sorted(keep)]
+
+def lineup_cbc_solver(time_limit=30, warm_start=False):
+    """Create the CBC solver used for PuLP lineup models.
+    
+    CBC runs its branch-and-bound search on every available core and with its
+    log output suppressed, instead of single-threaded and echoing to stdout.
+    With warm_start, the variables' initial values are passed to CBC as a MIP start.
+    """
+    return pulp.PULP_CBC_CMD(timeLimit=time_limit, threads=os.cpu_count(), msg=False, warmStart=warm_start)
+
+# Names of the variables chosen in the last PuLP lineup solved for each
+# (database, team ID, lineup type), oldest first
+_lineup_warm_starts = {}
+
+# Most lineups kept for warm starts; the oldest is dropped beyond this
+MAX_LINEUP_WARM_STARTS = 128
+
+def lineup_warm_start_key(team_id, lineup_type):
+    """Key of a team's lineup in _lineup_warm_starts for the configured database."""
+    return (current_app.config['DATABASE'], team_id, lineup_type)
+
+def apply_lineup_warm_start(team_id, lineup_type, prob, variables):
+    """Seed the lineup variables with the team's previous solution.
+    
+    The previous lineup is used only if every one of its variables exists in the
+    new model and, with its variables set to 1 and all others to 0, it satisfies
+    every constraint of prob: all required positions filled, the budget met and
+    no player used twice. Otherwise the initial values are cleared and CBC
+    starts cold.
+    
+    Args:
+        team_id (int): Team ID
+        lineup_type (str): "hitting", "pitching", or "both"
+        prob (pulp.LpProblem): The new lineup model, with all its constraints
+        variables (list): The new model's binary player-position variables
+        
+    Returns:
+        bool: True if initial values were set and CBC should warm start
+    """
+    chosen = _lineup_warm_starts.get(lineup_warm_start_key(team_id, lineup_type))
+    if not chosen:
+        return False
+    
+    if not chosen <= {var.name for var in variables}:
+        return False
+    
+    for var in variables:
+        var.setInitialValue(1 if var.name in chosen else 0)
+    
+    if all(constraint.valid(1e-6) for constraint in prob.constraints.values()):
+        return True
+    
+    for var in variables:
+        var.varValue = None
+    return False
+
+def store_lineup_warm_start(team_id, lineup_type, variables):
+    """Remember the chosen variables of a solved lineup model for the team's next solve."""
+    key = lineup_warm_start_key(team_id, lineup_type)
+    _lineup_warm_starts.pop(key, None)
+    _lineup_warm_starts[key] = {
+        var.name for var in variables
+        if var.varValue is not None and var.varValue > 0.5
+    }
+    
+    while len(_lineup_warm_starts) > MAX_LINEUP_WARM_STARTS:
+        del _lineup_warm_starts[next(iter(_lineup_warm_starts))]
+
+# SciPy MILP status codes mapped to the equivalent PuLP status names
+MILP_STATUS_NAMES = {
+    0: 'Optimal',
+    1: 'Not Solved',
+    2: 'Infeasible',
+    3: 'Unbounded',
+    4: 'Undefined'
+}
+
+def solve_lineup_milp(candidates, positions, budget, time_limit=30):
+    """Pick the lineup with the highest total SG value using SciPy's MILP solver.
+    
+    Solves the same model as the PuLP/CBC formulation (one binary variable per
+    eligible player-position pair, a budget constraint, every position filled
+    exactly once, every player used at most once), but the constraint matrices
+    are built directly as sparse arrays and HiGHS runs in-process, so there is
+    no model file or solver subprocess per request.
+    
+    Args:
+        candidates (list): (player_key, position_key, sg_value, salary) tuples, one per
+            eligible player-position pair
+        positions (list): Position keys that must each be filled by exactly one player
+        budget (float): Maximum total salary
+        time_limit (int): Solver timeout in seconds
+        
+    Returns:
+        tuple: (indices of the selected candidates, solver status name). The indices
+            are None if no optimal solution was found.
+    """
+    if not candidates:
+        return None, MILP_STATUS_NAMES[2]
+    
+    num_candidates = len(candidates)
+    sg_values = np.array([candidate[2] for candidate in candidates], dtype=np.float64)
+    salaries = np.array([candidate[3] for candidate in candidates], dtype=np.float64)
+    
+    position_index = {position: index for index, position in enumerate(positions)}
+    player_index = {}
+    position_rows = np.empty(num_candidates, dtype=np.int64)
+    player_rows = np.empty(num_candidates, dtype=np.int64)
+    for column, (player_key, position_key, _, _) in enumerate(candidates):
+        position_rows[column] = position_index[position_key]
+        player_rows[column] = player_index.setdefault(player_key, len(player_index))
+    
+    columns = np.arange(num_candidates)
+    ones = np.ones(num_candidates)
+    constraints = [
+        # Budget constraint
+        LinearConstraint(salaries.reshape(1, -1), -np.inf, budget),
+        # Each position must be filled by exactly one player
+        LinearConstraint(sparse.csr_array((ones, (position_rows, columns)), shape=(len(positions), num_candidates)), 1, 1),
+        # Each player can be assigned to at most one position
+        LinearConstraint(sparse.csr_array((ones, (player_rows, columns)), shape=(len(player_index), num_candidates)), -np.inf, 1)
+    ]
+    
+    # milp minimizes, so negate the SG values to maximize total SG
+    result = milp(
+        -sg_values,
+        constraints=constraints,
+        integrality=np.ones(num_candidates),
+        bounds=Bounds(0, 1),
+        options={'time_limit': time_limit}
+    )
+    
+    status = MILP_STATUS_NAMES.get(result.status, 'Undefined')
+    if result.status != 0:
+        return None, status
+    
+    return np.flatnonzero(result.x > 0.5).tolist(), status
+
 # Helper function to determine required positions
-def get_required_positions(team_id, lineup_type, bench_positions):
-    """Determine the required positions to fill based on lineup type and bench positions."""
-    db = get_db()
-    required_positions = []
+def get_required_positions(db, team_id, lineup_type, bench_positions):
+    """Determine the required positions to fill based on lineup type and bench positions.
     
+    Args:
+        db (sqlite3.Connection): The request's database connection
+        team_id (int): Team ID
+        lineup_type (str): "hitting" or "pitching"
+        bench_positions (int): Number of bench positions to include
+        
+    Returns:
+        list: Empty roster positions in roster order
+    """
     if lineup_type == 'hitting':
         # Get current hitter positions
-        team_hitters = db.execute('SELECT * FROM TeamHitters WHERE HittingTeamId = ?', (team_id,)).fetchone()
-        
-        if team_hitters:
-            team_hitters_dict = dict(team_hitters)
-            # Find empty positions
-            for position in HITTER_POSITIONS:
-                if position in team_hitters_dict and not team_hitters_dict[position]:
-                    # Only include bench positions up to the specified number
-                    if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                        required_positions.append(position)
-        else:
-            # If no team hitters record exists, all positions are required
-            # Only include bench positions up to the specified number
-            for position in HITTER_POSITIONS:
-                if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                    required_positions.append(position)
+        team_hitters = db.execute(SQL_TEAM_HITTER_POSITIONS, (team_id,)).fetchone()
+        
+        # Find empty positions; if no team hitters record exists, all positions are required
+        required_positions = open_positions(HITTER_POSITION_SPECS, team_hitters, bench_positions)
     
     else:  # lineup_type == 'pitching'
         # Get current pitcher positions
-        team_pitchers = db.execute('SELECT * FROM TeamPitchers WHERE PitchingTeamId = ?', (team_id,)).fetchone()
-        
-        if team_pitchers:
-            team_pitchers_dict = dict(team_pitchers)
-            # Find empty positions
-            for position in PITCHER_POSITIONS:
-                if position in team_pitchers_dict and not team_pitchers_dict[position]:
-                    # Only include bench positions up to the specified number
-                    if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                        required_positions.append(position)
-        else:
-            # If no team pitchers record exists, all positions are required
-            # Only include bench positions up to the specified number
-            for position in PITCHER_POSITIONS:
-                if not position.startswith('Bench') or (position.startswith('Bench') and int(position[5:]) <= bench_positions):
-                    required_positions.append(position)
+        team_pitchers = db.execute(SQL_TEAM_PITCHER_POSITIONS, (team_id,)).fetchone()
+        
+        # Find empty positions; if no team pitchers record exists, all positions are required
+        required_positions = open_positions(PITCHER_POSITION_SPECS, team_pitchers, bench_positions)
     
     return required_positions
 
@@ -2481,25 +2978,13 @@ def get_free_agent_hitters():
     try:
         db = get_db()
         
-        query = '''
-            SELECT * FROM Hitters 
+        # SQLite casts the numeric columns, so the rows go straight to plain dicts
+        query = f'''
+            SELECT {HITTER_SELECT_COLUMNS} FROM Hitters 
             WHERE Status = 'NA'
         '''
         
-        hitters = db.execute(query).fetchall()
-        
-        # Convert to list of dictionaries and ensure numeric values are Python native types
-        result = []
-        for player in hitters:
-            player_dict = dict(player)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = int(player_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'AVG', 'SGCalc']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = float(player_dict[key])
-            result.append(player_dict)
+        result = query_dicts(db, query)
             
         return jsonify({
             'hitters': result
@@ -2518,25 +3003,13 @@ def get_free_agent_pitchers():
     try:
         db = get_db()
         
-        query = '''
-            SELECT * FROM Pitchers 
+        # SQLite casts the numeric columns, so the rows go straight to plain dicts
+        query = f'''
+            SELECT {PITCHER_SELECT_COLUMNS} FROM Pitchers 
             WHERE Status = 'NA'
         '''
         
-        pitchers = db.execute(query).fetchall()
-        
-        # Convert to list of dictionaries and ensure numeric values are Python native types
-        result = []
-        for player in pitchers:
-            player_dict = dict(player)
-            # Convert numeric fields to appropriate Python types
-            for key in ['Age', 'W', 'QS', 'G', 'SV', 'HLD', 'SVH', 'IP', 'SO']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = int(player_dict[key])
-            for key in ['OriginalSalary', 'AdjustedSalary', 'AuctionSalary', 'ERA', 'WHIP', 'K_9', 'BB_9', 'BABIP', 'FIP', 'SGCalc']:
-                if key in player_dict and player_dict[key] is not None:
-                    player_dict[key] = float(player_dict[key])
-            result.append(player_dict)
+        result = query_dicts(db, query)
             
         return jsonify({
             'pitchers': result
@@ -2573,6 +3046,9 @@ def set_player_as_free_agent(player_type, player_id):
             
         db.commit()
         
+        # Rosters or available players changed, so earlier lineups are stale warm starts
+        _lineup_warm_starts.clear()
+        
         return jsonify({
             'success': True,
             'message': f'{player_type.capitalize()} with ID {player_id} has been set as a free agent'
@@ -3,16 +3,52 @@ import csv
 import os
 from flask import Flask, g, current_app
 
+# Prepared statements kept per connection (the sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Databases already switched to WAL by this process
+_wal_databases = set()
+
 def get_db():
     if 'db' not in g:
+        database = current_app.config['DATABASE']
         g.db = sqlite3.connect(
-            current_app.config['DATABASE'],
-            detect_types=sqlite3.PARSE_DECLTYPES
+            database,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=STATEMENT_CACHE_SIZE
         )
         g.db.row_factory = sqlite3.Row
-    
+
+        # WAL lets the GET endpoints read while a write is in progress. The journal
+        # mode is stored in the database file, so it is only set on the first connection
+        if database not in _wal_databases:
+            g.db.execute('PRAGMA journal_mode=WAL')
+            _wal_databases.add(database)
+
+        # synchronous=NORMAL avoids an fsync on every commit (safe under WAL)
+        g.db.execute('PRAGMA synchronous=NORMAL')
+        g.db.execute('PRAGMA temp_store=MEMORY')
+
+        # 64 MB page cache and 256 MB memory-mapped I/O keep repeated reads off disk
+        g.db.execute('PRAGMA cache_size=-64000')
+        g.db.execute('PRAGMA mmap_size=268435456')
+
     return g.db
 
+def query_dicts(db, sql, params=()):
+    """Run a query and return its rows as plain dicts.
+    
+    The rows are fetched as tuples and zipped with the column names once per
+    query, which is cheaper than building a sqlite3.Row for every row and then
+    copying it with dict(row).
+    """
+    cursor = db.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
 def close_db(e=None):
     db = g.pop('db', None)
     
@@ -34,61 +70,70 @@ def init_db():
     
     db.commit()
 
+def read_csv_rows(csv_path, columns, optional_columns=()):
+    """Yield one tuple per CSV row with the given columns in order.
+    
+    Empty strings are converted to None so the tuples can be bound directly to
+    an INSERT. A missing column raises KeyError, unless it is one of
+    optional_columns, which are read as None when the file doesn't have them.
+    """
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield tuple(
+                (row.get(column) if column in optional_columns else row[column]) or None
+                for column in columns
+            )
+
+def bulk_insert(db, sql, rows):
+    """Insert all rows with a single executemany call.
+    
+    The statement is prepared once and the whole import runs in one
+    transaction. Durability is relaxed while loading since a failed import
+    is simply re-run.
+    """
+    db.execute('PRAGMA synchronous=OFF')
+    try:
+        db.executemany(sql, rows)
+        db.commit()
+    finally:
+        db.execute('PRAGMA synchronous=NORMAL')
+
 def import_hitters():
     db = get_db()
     
     csv_path = os.path.join(os.path.dirname(__file__), 'players-hitters.csv')
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        csv_reader = csv.DictReader(f)
-        
-        for row in csv_reader:
-            # Convert empty strings to None
-            for key, value in row.items():
-                if value == '':
-                    row[key] = None
-            
-            db.execute('''
-                INSERT INTO Hitters (
-                    PlayerName, Team, Position, Status, Age, 
-                    HittingTeamId, OriginalSalary, AdjustedSalary, AuctionSalary,
-                    G, PA, AB, H, HR, R, RBI, BB, HBP, SB, AVG
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                row['Name'], row['Team'], row['Position'], row['Status'], row['Age'],
-                row['HittingTeamId'], row['OriginalSalary'], row['AdjustedSalary'], row['AuctionSalary'],
-                row['G'], row['PA'], row['AB'], row['H'], row['HR'], row['R'], row['RBI'], 
-                row['BB'], row['HBP'], row['SB'], row['AVG']
-            ))
+    rows = read_csv_rows(csv_path, (
+        'Name', 'Team', 'Position', 'Status', 'Age',
+        'HittingTeamId', 'OriginalSalary', 'AdjustedSalary', 'AuctionSalary',
+        'G', 'PA', 'AB', 'H', 'HR', 'R', 'RBI', 'BB', 'HBP', 'SB', 'AVG'
+    ))
     
-    db.commit()
+    bulk_insert(db, '''
+        INSERT INTO Hitters (
+            PlayerName, Team, Position, Status, Age, 
+            HittingTeamId, OriginalSalary, AdjustedSalary, AuctionSalary,
+            G, PA, AB, H, HR, R, RBI, BB, HBP, SB, AVG
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
 
 def import_pitchers():
     db = get_db()
     
     csv_path = os.path.join(os.path.dirname(__file__), 'players-pitchers.csv')
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        csv_reader = csv.DictReader(f)
-        
-        for row in csv_reader:
-            # Convert empty strings to None
-            for key, value in row.items():
-                if value == '':
-                    row[key] = None
-            
-            db.execute('''
-                INSERT INTO Pitchers (
-                    PlayerName, Team, Position, Status, Age, 
-                    PitchingTeamId, OriginalSalary, AdjustedSalary, AuctionSalary,
-                    W, QS, ERA, WHIP, G, SV, HLD, SVH, IP, SO, K_9, BB_9, BABIP, FIP
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                row['Name'], row['Team'], row['Position'], row['Status'], row['Age'],
-                row['PitchingTeamId'], row['OriginalSalary'], row['AdjustedSalary'], row['AuctionSalary'],
-                row['W'], row['QS'], row['ERA'], row['WHIP'], row['G'], row['SV'], row['HLD'], row['SVH'], 
-                row['IP'], row['SO'], row['K/9'], row['BB/9'], row.get('BABIP'), row.get('FIP')
-            ))
+    rows = read_csv_rows(csv_path, (
+        'Name', 'Team', 'Position', 'Status', 'Age',
+        'PitchingTeamId', 'OriginalSalary', 'AdjustedSalary', 'AuctionSalary',
+        'W', 'QS', 'ERA', 'WHIP', 'G', 'SV', 'HLD', 'SVH',
+        'IP', 'SO', 'K/9', 'BB/9', 'BABIP', 'FIP'
+    ), optional_columns=('BABIP', 'FIP'))
     
-    db.commit()
+    bulk_insert(db, '''
+        INSERT INTO Pitchers (
+            PlayerName, Team, Position, Status, Age, 
+            PitchingTeamId, OriginalSalary, AdjustedSalary, AuctionSalary,
+            W, QS, ERA, WHIP, G, SV, HLD, SVH, IP, SO, K_9, BB_9, BABIP, FIP
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
 
 def init_app(app):
     app.teardown_appcontext(close_db)
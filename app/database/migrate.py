@@ -20,80 +20,52 @@ def close_db(e=None):
     if db is not None:
         db.close()
 
+# Columns added to the Pitchers table since the original schema
+PITCHER_NEW_COLUMNS = (
+    ('BABIP', 'REAL'),
+    ('FIP', 'REAL')
+)
+
+# Indexes added since the original schema, each with the table and column it needs;
+# init-db creates them from schema.sql, existing databases get them here
+NEW_INDEXES = (
+    ('Hitters', 'HittingTeamId', 'CREATE INDEX IF NOT EXISTS idx_hitters_team_status ON Hitters (HittingTeamId, Status)'),
+    ('Pitchers', 'PitchingTeamId', 'CREATE INDEX IF NOT EXISTS idx_pitchers_team_status ON Pitchers (PitchingTeamId, Status)'),
+    ('Hitters', 'SGCalc', "CREATE INDEX IF NOT EXISTS idx_hitters_sgcalc ON Hitters (SGCalc DESC) WHERE Status = 'FA'"),
+    ('Pitchers', 'SGCalc', "CREATE INDEX IF NOT EXISTS idx_pitchers_sgcalc ON Pitchers (SGCalc DESC) WHERE Status = 'FA'"),
+    ('Hitters', 'Status', "CREATE INDEX IF NOT EXISTS idx_hitters_status_na ON Hitters (Status) WHERE Status = 'NA'"),
+    ('Pitchers', 'Status', "CREATE INDEX IF NOT EXISTS idx_pitchers_status_na ON Pitchers (Status) WHERE Status = 'NA'")
+)
+
 def migrate_db():
-    """Migrate the database to add new columns to Pitchers table."""
+    """Migrate the database to add new columns to Pitchers table and the new indexes."""
     db = get_db()
     
-    # Create a backup of the current data
-    db.execute("BEGIN TRANSACTION")
+    # ALTER TABLE ADD COLUMN only updates the schema, so existing rows are not
+    # rewritten; columns that already exist are skipped so the migration can be re-run
+    existing_columns = {row['name'] for row in db.execute("PRAGMA table_info(Pitchers)")}
     
-    try:
-        # Step 1: Backup Pitchers data
-        db.execute("CREATE TABLE IF NOT EXISTS Pitchers_backup AS SELECT * FROM Pitchers")
-        
-        # Step 2: Drop the existing Pitchers table
-        db.execute("DROP TABLE IF EXISTS Pitchers")
-        
-        # Step 3: Create the new Pitchers table with additional columns
-        db.execute('''
-        CREATE TABLE Pitchers (
-            PitchingPlayerId INTEGER PRIMARY KEY,
-            PlayerName TEXT NOT NULL,
-            Team TEXT,
-            Position TEXT,
-            Status TEXT,
-            Age INTEGER,
-            PitchingTeamId INTEGER,
-            OriginalSalary REAL,
-            AdjustedSalary REAL,
-            AuctionSalary REAL,
-            W INTEGER,
-            QS INTEGER,
-            ERA REAL,
-            WHIP REAL,
-            G INTEGER,
-            SV INTEGER,
-            HLD INTEGER,
-            SVH INTEGER,
-            IP INTEGER,
-            SO INTEGER,
-            K_9 REAL,
-            BB_9 REAL,
-            BABIP REAL,
-            FIP REAL,
-            FOREIGN KEY (PitchingTeamId) REFERENCES TeamPitchers (PitchingTeamId)
-        )
-        ''')
-        
-        # Step 4: Restore data from backup
-        db.execute('''
-        INSERT INTO Pitchers (
-            PitchingPlayerId, PlayerName, Team, Position, Status, Age, 
-            PitchingTeamId, OriginalSalary, AdjustedSalary, AuctionSalary,
-            W, QS, ERA, WHIP, G, SV, HLD, SVH, IP, SO, K_9, BB_9
-        )
-        SELECT 
-            PitchingPlayerId, PlayerName, Team, Position, Status, Age, 
-            PitchingTeamId, OriginalSalary, AdjustedSalary, AuctionSalary,
-            W, QS, ERA, WHIP, G, SV, HLD, SVH, IP, SO, K_9, BB_9
-        FROM Pitchers_backup
-        ''')
-        
-        # Step 5: Drop the backup table
-        db.execute("DROP TABLE Pitchers_backup")
-        
-        # Commit the transaction
-        db.execute("COMMIT")
-        
-    except Exception as e:
-        # Rollback in case of error
-        db.execute("ROLLBACK")
-        raise e
+    for column, column_type in PITCHER_NEW_COLUMNS:
+        if column not in existing_columns:
+            db.execute(f"ALTER TABLE Pitchers ADD COLUMN {column} {column_type}")
+    
+    # CREATE INDEX IF NOT EXISTS skips indexes that are already there; an index is
+    # left out if its table is older than the column it covers
+    table_columns = {
+        table: {row['name'] for row in db.execute(f"PRAGMA table_info({table})")}
+        for table in ('Hitters', 'Pitchers')
+    }
+    
+    for table, column, sql in NEW_INDEXES:
+        if column in table_columns[table]:
+            db.execute(sql)
+    
+    db.commit()
 
 @click.command('migrate-db')
 @with_appcontext
 def migrate_db_command():
-    """Migrate the database to add new columns."""
+    """Migrate the database to add new columns and indexes."""
     migrate_db()
     click.echo('Database migration completed successfully.')
 
@@ -121,6 +121,7 @@ CREATE TABLE Hitters (
     HBP INTEGER,
     SB INTEGER,
     AVG REAL,
+    SGCalc REAL,
     FOREIGN KEY (HittingTeamId) REFERENCES TeamHitters (HittingTeamId)
 );
 
@@ -150,5 +151,18 @@ CREATE TABLE Pitchers (
     BB_9 REAL,
     BABIP REAL,
     FIP REAL,
+    SGCalc REAL,
     FOREIGN KEY (PitchingTeamId) REFERENCES TeamPitchers (PitchingTeamId)
-);
\ No newline at end of file
+);
+
+-- Indexes for the team roster and available player lookups
+CREATE INDEX IF NOT EXISTS idx_hitters_team_status ON Hitters (HittingTeamId, Status);
+CREATE INDEX IF NOT EXISTS idx_pitchers_team_status ON Pitchers (PitchingTeamId, Status);
+
+-- Partial indexes so top players by SGCalc are read in order without a sort
+CREATE INDEX IF NOT EXISTS idx_hitters_sgcalc ON Hitters (SGCalc DESC) WHERE Status = 'FA';
+CREATE INDEX IF NOT EXISTS idx_pitchers_sgcalc ON Pitchers (SGCalc DESC) WHERE Status = 'FA';
+
+-- Partial indexes for the free-agent lists (players with Status 'NA')
+CREATE INDEX IF NOT EXISTS idx_hitters_status_na ON Hitters (Status) WHERE Status = 'NA';
+CREATE INDEX IF NOT EXISTS idx_pitchers_status_na ON Pitchers (Status) WHERE Status = 'NA';
@@ -1,34 +1,45 @@
 import csv
 import os
 
+def padded_rows(reader, width):
+    """Yield each CSV row with empty BABIP and FIP values appended.
+    
+    Blank lines are skipped and short rows padded to width, matching what
+    DictReader/DictWriter produced.
+    """
+    for row in reader:
+        if row:
+            yield row + [''] * (width - len(row)) + ['', '']
+
 def update_pitchers_csv():
     """Update the pitchers CSV file to include BABIP and FIP columns."""
     csv_path = os.path.join(os.path.dirname(__file__), 'players-pitchers.csv')
     temp_path = os.path.join(os.path.dirname(__file__), 'players-pitchers-temp.csv')
     
-    # Read the existing CSV
+    # Check if the columns already exist, reading only the header row
     with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        
-        # Check if the columns already exist
-        if 'BABIP' in fieldnames and 'FIP' in fieldnames:
-            print("CSV already has BABIP and FIP columns.")
-            return
+        fieldnames = next(csv.reader(f), [])
+    
+    if 'BABIP' in fieldnames and 'FIP' in fieldnames:
+        print("CSV already has BABIP and FIP columns.")
+        return
+    
+    # Read the existing CSV; a 1 MB buffer keeps the read and write calls few
+    with open(csv_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        next(reader, None)
         
         # Add the new columns
+        width = len(fieldnames)
         fieldnames = fieldnames + ['BABIP', 'FIP']
         
         # Write to a temporary file
-        with open(temp_path, 'w', encoding='utf-8', newline='') as temp_file:
-            writer = csv.DictWriter(temp_file, fieldnames=fieldnames)
-            writer.writeheader()
+        with open(temp_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as temp_file:
+            writer = csv.writer(temp_file)
+            writer.writerow(fieldnames)
             
             # Copy the existing data and add empty values for new columns
-            for row in reader:
-                row['BABIP'] = ''
-                row['FIP'] = ''
-                writer.writerow(row)
+            writer.writerows(padded_rows(reader, width))
     
     # Replace the original file with the updated one
     os.replace(temp_path, csv_path)
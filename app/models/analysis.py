@@ -1,7 +1,45 @@
 import pandas as pd
 import numpy as np
+from functools import lru_cache
+from flask import current_app
 from app.database.db import get_db
 
+def pairwise_corrcoef(values):
+    """Correlation matrix of the columns of values, ignoring NaNs pair by pair.
+    
+    Matches DataFrame.corr(): each pair of columns uses only the rows where both
+    are present. The per-pair sums are computed for all pairs at once with
+    matrix products.
+    
+    Args:
+        values: 2-D float64 array with one column per category
+        
+    Returns:
+        Square array of correlation coefficients, NaN where a pair has fewer
+        than two rows in common or no variance
+    """
+    present = ~np.isnan(values)
+    mask = present.astype(np.float64)
+    
+    # Shift each column by its mean first; correlation is unaffected and the
+    # sums below lose much less precision
+    column_means = np.where(present, values, 0.0).sum(axis=0) / np.maximum(present.sum(axis=0), 1)
+    centered = np.where(present, values - column_means, 0.0)
+    
+    # For columns i and j over their common rows: count, sum of i, sum of i² and sum of i*j
+    counts = mask.T @ mask
+    sums = centered.T @ mask
+    squares = (centered ** 2).T @ mask
+    products = centered.T @ centered
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = products - sums * sums.T / counts
+        variance = squares - sums ** 2 / counts
+        correlation = covariance / np.sqrt(variance * variance.T)
+    
+    correlation[counts < 2] = np.nan
+    return correlation
+
 def analyze_data(model_id):
     """Analyze data for a specific model and store results.
     
@@ -22,49 +60,28 @@ def analyze_data(model_id):
     # Get data from database
     db = get_db()
     
-    # Get all teams for this model
-    teams = db.execute(
+    # Get all teams for this model with their statistics in one query; teams
+    # without statistics still get a row with a NULL category
+    rows = pd.read_sql_query(
         '''
-        SELECT t.id, t.team_name, t.season_year, t.made_playoffs, t.wins, t.losses, t.ties
+        SELECT t.id, t.team_name, t.season_year, t.made_playoffs, t.wins, t.losses, t.ties,
+               s.category, s.value
         FROM teams t
+        LEFT JOIN statistics s ON s.team_id = t.id
         WHERE t.model_id = ?
+        ORDER BY t.id, s.id
         ''',
-        (model_id,)
-    ).fetchall()
-    
-    # Get all statistics for these teams
-    team_stats = {}
-    for team in teams:
-        stats = db.execute(
-            '''
-            SELECT category, value
-            FROM statistics
-            WHERE team_id = ?
-            ''',
-            (team['id'],)
-        ).fetchall()
-        
-        team_stats[team['id']] = {
-            'team_data': dict(team),
-            'stats': {stat['category']: stat['value'] for stat in stats}
-        }
-    
-    # Convert to DataFrame for analysis
-    data = []
-    for team_id, team_info in team_stats.items():
-        row = {
-            'team_id': team_id,
-            'team_name': team_info['team_data']['team_name'],
-            'season_year': team_info['team_data']['season_year'],
-            'made_playoffs': team_info['team_data']['made_playoffs'],
-            'wins': team_info['team_data']['wins'],
-            'losses': team_info['team_data']['losses'],
-            'ties': team_info['team_data']['ties']
-        }
-        row.update(team_info['stats'])
-        data.append(row)
+        db,
+        params=(model_id,)
+    )
     
-    df = pd.DataFrame(data)
+    # Pivot to one row per team with a column per category
+    team_columns = ['id', 'team_name', 'season_year', 'made_playoffs', 'wins', 'losses', 'ties']
+    teams = rows[team_columns].drop_duplicates('id')
+    stats = rows.dropna(subset=['category']).pivot_table(
+        index='id', columns='category', values='value', aggfunc='last'
+    )
+    df = teams.join(stats, on='id').rename(columns={'id': 'team_id'}).reset_index(drop=True)
     
     # Calculate benchmarks
     categories = ['HR', 'RBI', 'R', 'SB', 'AVG', 'ERA', 'WHIP', 'W', 'SV_H', 'K']
@@ -77,49 +94,48 @@ def analyze_data(model_id):
     if len(playoff_teams) == 0:
         raise ValueError("No playoff teams found in the dataset. Cannot calculate benchmarks.")
     
-    benchmarks = {}
-    for category in categories:
-        if category in df.columns:
-            # For pitching stats (ERA, WHIP), lower is better
-            if category in ['ERA', 'WHIP']:
-                benchmarks[category] = {
-                    'mean_value': float(playoff_teams[category].mean()),
-                    'median_value': float(playoff_teams[category].median()),
-                    'std_dev': float(playoff_teams[category].std()),
-                    'min_value': float(playoff_teams[category].min()),  # Best value for pitching stats
-                    'max_value': float(playoff_teams[category].max())
-                }
-            else:
-                # For batting stats, higher is better
-                benchmarks[category] = {
-                    'mean_value': float(playoff_teams[category].mean()),
-                    'median_value': float(playoff_teams[category].median()),
-                    'std_dev': float(playoff_teams[category].std()),
-                    'min_value': float(playoff_teams[category].min()),
-                    'max_value': float(playoff_teams[category].max())  # Best value for batting stats
-                }
-    
-    # Calculate correlations between categories
+    # Summarize every category over the playoff teams in one aggregation;
+    # for pitching stats (ERA, WHIP) lower is better, so min_value is the best value
     valid_categories = [cat for cat in categories if cat in df.columns]
-    correlation_matrix = df[valid_categories].corr()
-    correlations = []
-    
-    for i, cat1 in enumerate(valid_categories):
-        for j, cat2 in enumerate(valid_categories):
-            if i < j:  # Only store each pair once
-                correlations.append({
-                    'category1': cat1,
-                    'category2': cat2,
-                    'coefficient': float(correlation_matrix.loc[cat1, cat2])
-                })
-    
-    # Store benchmarks in database
-    for category, values in benchmarks.items():
-        db.execute(
-            '''
-            INSERT INTO benchmarks (model_id, category, mean_value, median_value, std_dev, min_value, max_value)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''',
+    summary = playoff_teams[valid_categories].agg(['mean', 'median', 'std', 'min', 'max'])
+    
+    # Convert the whole summary to Python floats at once, one row per category
+    benchmark_fields = ('mean_value', 'median_value', 'std_dev', 'min_value', 'max_value')
+    summary_rows = summary.to_numpy(dtype=np.float64).T.tolist()
+    benchmarks = {
+        category: dict(zip(benchmark_fields, row))
+        for category, row in zip(valid_categories, summary_rows)
+    }
+    
+    # Calculate correlations between categories over the whole matrix at once;
+    # with missing values each pair uses the teams that have both
+    values = df[valid_categories].to_numpy(dtype=np.float64)
+    if valid_categories and not np.isnan(values).any():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation_matrix = np.atleast_2d(np.corrcoef(values, rowvar=False))
+    else:
+        correlation_matrix = pairwise_corrcoef(values)
+    
+    # The matrix is symmetric, so only the pairs above the diagonal are stored
+    upper_rows, upper_cols = np.triu_indices(len(valid_categories), k=1)
+    coefficients = correlation_matrix[upper_rows, upper_cols].tolist()
+    correlations = [
+        {
+            'category1': valid_categories[i],
+            'category2': valid_categories[j],
+            'coefficient': coefficient
+        }
+        for i, j, coefficient in zip(upper_rows.tolist(), upper_cols.tolist(), coefficients)
+    ]
+    
+    # Store benchmarks and correlations in database, one prepared statement each,
+    # committed together below
+    db.executemany(
+        '''
+        INSERT INTO benchmarks (model_id, category, mean_value, median_value, std_dev, min_value, max_value)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''',
+        [
             (
                 model_id, 
                 category, 
@@ -129,76 +145,126 @@ def analyze_data(model_id):
                 values['min_value'],
                 values['max_value']
             )
-        )
+            for category, values in benchmarks.items()
+        ]
+    )
     
-    # Store correlations in database
-    for corr in correlations:
-        db.execute(
-            '''
-            INSERT INTO correlations (model_id, category1, category2, coefficient)
-            VALUES (?, ?, ?, ?)
-            ''',
-            (model_id, corr['category1'], corr['category2'], corr['coefficient'])
-        )
+    db.executemany(
+        '''
+        INSERT INTO correlations (model_id, category1, category2, coefficient)
+        VALUES (?, ?, ?, ?)
+        ''',
+        [(model_id, corr['category1'], corr['category2'], corr['coefficient']) for corr in correlations]
+    )
     
     db.commit()
     
+    # Cached what-if data for this model is now out of date
+    load_what_if_arrays.cache_clear()
+    
     return {
         'benchmarks': benchmarks,
         'correlations': correlations
     }
 
-def calculate_what_if(model_id, adjustments):
-    """Calculate what-if scenario based on adjusted values.
+# Kept at module level so every what-if load binds the same SQL text and
+# reuses the connection's cached prepared statement
+SQL_WHAT_IF_BENCHMARKS = '''
+    SELECT category, mean_value FROM benchmarks
+    WHERE model_id = ?
+'''
+SQL_WHAT_IF_CORRELATIONS = '''
+    SELECT category1, category2, coefficient FROM correlations
+    WHERE model_id = ?
+'''
+
+# Row count and newest row ID of a model's benchmarks and correlations; the
+# app never updates these rows in place, so rewriting or deleting any of them
+# changes the result, whichever process does it
+SQL_WHAT_IF_VERSION = '''
+    SELECT (SELECT COUNT(*) || ':' || IFNULL(MAX(id), '') FROM benchmarks WHERE model_id = ?),
+           (SELECT COUNT(*) || ':' || IFNULL(MAX(id), '') FROM correlations WHERE model_id = ?)
+'''
+
+def load_what_if_model(model_id):
+    """Load a model's benchmarks and correlations as arrays for what-if calculations.
     
     Args:
-        model_id: ID of the model to use for calculations
-        adjustments: Dictionary of category adjustments
+        model_id: ID of the model to load
         
     Returns:
-        Dictionary of adjusted values for all categories
+        Tuple of (categories, category index, benchmark mean values, correlation
+        matrix); pairs without a stored correlation are NaN in the matrix. The
+        arrays are shared between calls and are read-only.
+    """
+    version = tuple(get_db().execute(SQL_WHAT_IF_VERSION, (model_id, model_id)).fetchone())
+    return load_what_if_arrays(current_app.config['DATABASE'], model_id, version)
+
+@lru_cache(maxsize=32)
+def load_what_if_arrays(database, model_id, version):
+    """Read a model's benchmarks and correlations into arrays.
+    
+    Results are cached per database path, model and version (the row counts
+    and newest row IDs of the model's benchmarks and correlations). The version
+    changes whenever the rows are rewritten or deleted, including by another
+    process, so a stale entry is never returned; analyze_data and delete_model
+    also clear the cache.
     """
     db = get_db()
     
-    # Get correlation data
-    correlations = db.execute(
-        'SELECT category1, category2, coefficient FROM correlations WHERE model_id = ?',
-        (model_id,)
-    ).fetchall()
+    # Get benchmark data
+    benchmarks = db.execute(SQL_WHAT_IF_BENCHMARKS, (model_id,)).fetchall()
     
-    correlation_dict = {}
+    benchmark_dict = {b['category']: float(b['mean_value']) for b in benchmarks}
+    categories = tuple(benchmark_dict)
+    category_index = {category: i for i, category in enumerate(categories)}
+    benchmark_values = np.array(list(benchmark_dict.values()), dtype=np.float64)
+    
+    # Get correlation data, stored in both directions
+    correlations = db.execute(SQL_WHAT_IF_CORRELATIONS, (model_id,)).fetchall()
+    
+    correlation_matrix = np.full((len(categories), len(categories)), np.nan)
     for corr in correlations:
-        if corr['category1'] not in correlation_dict:
-            correlation_dict[corr['category1']] = {}
-        if corr['category2'] not in correlation_dict:
-            correlation_dict[corr['category2']] = {}
-        
-        correlation_dict[corr['category1']][corr['category2']] = float(corr['coefficient'])
-        correlation_dict[corr['category2']][corr['category1']] = float(corr['coefficient'])
+        i = category_index.get(corr['category1'])
+        j = category_index.get(corr['category2'])
+        if i is not None and j is not None:
+            correlation_matrix[i, j] = correlation_matrix[j, i] = float(corr['coefficient'])
     
-    # Get benchmark data
-    benchmarks = db.execute(
-        'SELECT category, mean_value FROM benchmarks WHERE model_id = ?',
-        (model_id,)
-    ).fetchall()
+    benchmark_values.setflags(write=False)
+    correlation_matrix.setflags(write=False)
     
-    benchmark_dict = {b['category']: float(b['mean_value']) for b in benchmarks}
+    return categories, category_index, benchmark_values, correlation_matrix
+
+def calculate_what_if(model_id, adjustments):
+    """Calculate what-if scenario based on adjusted values.
     
-    # Calculate adjusted values
-    results = benchmark_dict.copy()
+    Args:
+        model_id: ID of the model to use for calculations
+        adjustments: Dictionary of category adjustments
+        
+    Returns:
+        Dictionary of adjusted values for all categories
+    """
+    categories, category_index, benchmark_values, correlation_matrix = load_what_if_model(model_id)
     
     # Update with user adjustments
-    for category, value in adjustments.items():
-        results[category] = float(value)
+    adjusted_index = [category_index[category] for category in adjustments]
+    adjusted_values = [float(value) for value in adjustments.values()]
+    results = benchmark_values.copy()
+    results[adjusted_index] = adjusted_values
+    
+    # Don't adjust categories the user explicitly set
+    user_set = np.zeros(len(categories), dtype=bool)
+    user_set[adjusted_index] = True
     
-    # Calculate related adjustments
-    for adj_category in adjustments:
-        delta_percent = (float(adjustments[adj_category]) - benchmark_dict[adj_category]) / benchmark_dict[adj_category]
+    # Calculate related adjustments one adjusted category at a time, over all
+    # correlated categories at once; a later adjustment overrides an earlier one
+    for i, value in zip(adjusted_index, adjusted_values):
+        benchmark = benchmark_values[i].item()
+        delta_percent = (value - benchmark) / benchmark
         
-        for related_category, coeff in correlation_dict.get(adj_category, {}).items():
-            if related_category not in adjustments:  # Don't adjust categories the user explicitly set
-                impact = delta_percent * coeff
-                results[related_category] = float(benchmark_dict[related_category] * (1 + impact))
+        related = ~np.isnan(correlation_matrix[i]) & ~user_set
+        results[related] = benchmark_values[related] * (1 + delta_percent * correlation_matrix[i, related])
     
     # Ensure all values are Python native types
-    return {k: float(v) for k, v in results.items()}
\ No newline at end of file
+    return dict(zip(categories, results.tolist()))
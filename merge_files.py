@@ -1,6 +1,7 @@
 import pandas as pd
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # File paths - update these to your actual file locations
 jcl_hitters_path = './pitching_files/JCL-Pitchers.csv'
@@ -8,44 +9,90 @@ auction_calculator_path = './pitching_files/p-auction.csv'
 projections_path = './pitching_files/p-projections-WHIP.csv'
 output_path = './pitching_files/merged_pitchers-updated.csv'
     
-def create_name_variants(name):
-    """Create different variants of a name to improve matching."""
-    if not isinstance(name, str):
-        return []
+# Name suffixes dropped when building name variants
+SUFFIX_PATTERN = re.compile(r'\s+(Jr\.?|Sr\.?|III|IV|V|II)$', re.IGNORECASE)
+
+def create_name_variants(names):
+    """Create different variants of every name in a Series to improve matching.
     
-    name = name.strip()
-    # Create variants without periods, Jr., Sr., etc.
-    no_suffix = re.sub(r'\s+(Jr\.?|Sr\.?|III|IV|V|II)$', '', name, flags=re.IGNORECASE)
-    no_periods = name.replace('.', '')
-    no_periods_suffix = no_suffix.replace('.', '')
+    Returns a DataFrame with one column per variant, in matching priority order.
+    Values that aren't strings have no variants (all NaN).
+    """
+    names = names.where(names.map(lambda name: isinstance(name, str))).str.strip()
     
-    return [name, no_suffix, no_periods, no_periods_suffix]
+    # Create variants without periods, Jr., Sr., etc.
+    no_suffix = names.str.replace(SUFFIX_PATTERN, '', regex=True)
+    no_periods = names.str.replace('.', '', regex=False)
+    no_periods_suffix = no_suffix.str.replace('.', '', regex=False)
+    
+    return pd.DataFrame({
+        'name': names,
+        'no_suffix': no_suffix,
+        'no_periods': no_periods,
+        'no_periods_suffix': no_periods_suffix
+    })
+
+def name_variant_table(names):
+    """Expand a Series of names into one row per name variant.
+    
+    The result keeps the original row labels as its index and numbers each
+    row's variants in create_name_variants order.
+    """
+    variant_columns = create_name_variants(names)
+    variants = variant_columns.stack().dropna()
+    priorities = variants.index.get_level_values(1)
+    variants = variants.droplevel(1).rename('variant').to_frame()
+    variants['priority'] = variant_columns.columns.get_indexer(priorities)
+    return variants
+
+def match_rows(jcl_names, source_names):
+    """Match JCL names to rows of a FanGraphs file through their name variants.
+    
+    Returns a Series mapping each matched JCL row label to the label of its
+    source row. When several source rows share a variant the last one is used,
+    and each JCL row takes its first variant that has a match.
+    """
+    source_variants = name_variant_table(source_names)
+    source_lookup = pd.Series(source_variants.index, index=source_variants['variant'].values)
+    source_lookup = source_lookup[~source_lookup.index.duplicated(keep='last')]
+    
+    jcl_variants = name_variant_table(jcl_names)
+    jcl_variants['source_row'] = jcl_variants['variant'].map(source_lookup)
+    matches = jcl_variants.dropna(subset=['source_row'])
+    matches = matches[~matches.index.duplicated(keep='first')]
+    return matches['source_row'].astype(int)
+
+def matched_columns(jcl_index, source_df, source_rows, columns):
+    """Build the FG_ columns of one FanGraphs file for every JCL row.
+    
+    Matched rows get their source row's values and unmatched rows are empty.
+    Columns keep the source dtype, with integer columns made nullable so
+    unmatched rows don't turn them into floats.
+    """
+    matched = source_df.loc[source_rows.values, list(columns)]
+    matched = matched.astype({
+        col: 'Int64' for col in columns if pd.api.types.is_integer_dtype(source_df[col])
+    })
+    matched.index = source_rows.index
+    return matched.reindex(jcl_index).rename(columns=columns)
 
 def merge_csv_files():
     print('Reading input files...')
     
-    # Read CSV files
-    jcl_df = pd.read_csv(jcl_hitters_path)
-    auction_df = pd.read_csv(auction_calculator_path)
-    projections_df = pd.read_csv(projections_path, encoding='latin1')
+    # Read CSV files concurrently; the C parser releases the GIL while tokenizing
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        jcl_future = executor.submit(pd.read_csv, jcl_hitters_path)
+        auction_future = executor.submit(pd.read_csv, auction_calculator_path)
+        projections_future = executor.submit(pd.read_csv, projections_path, encoding='latin1')
+    
+    jcl_df = jcl_future.result()
+    auction_df = auction_future.result()
+    projections_df = projections_future.result()
     
     print(f'JCLHitters rows: {len(jcl_df)}')
     print(f'Auction Calculator rows: {len(auction_df)}')
     print(f'Projections rows: {len(projections_df)}')
     
-    # Create mapping dictionaries for auction and projections data
-    auction_map = {}
-    for _, row in auction_df.iterrows():
-        if pd.notna(row['Name']):
-            for variant in create_name_variants(row['Name']):
-                auction_map[variant] = row
-    
-    projections_map = {}
-    for _, row in projections_df.iterrows():
-        if pd.notna(row['Name']):
-            for variant in create_name_variants(row['Name']):
-                projections_map[variant] = row
-    
     print('Merging data...')
     
     # Prepare columns for the merged data
@@ -53,45 +100,25 @@ def merge_csv_files():
     auction_columns = {col: f'FG_{col}' for col in auction_df.columns if col != 'Name'}
     projections_columns = {col: f'FG_{col}' for col in projections_df.columns if col != 'Name'}
     
-    # Create empty columns in the merged DataFrame
-    for col in auction_columns.values():
-        jcl_df[col] = None
-    
-    for col in projections_columns.values():
-        jcl_df[col] = None
-    
-    # Merge the data
-    auction_matches = 0
-    projections_matches = 0
-    
-    for idx, row in jcl_df.iterrows():
-        name_variants = create_name_variants(row['Name'])
-        
-        # Look for matching auction data
-        auction_row = None
-        for variant in name_variants:
-            if variant in auction_map:
-                auction_row = auction_map[variant]
-                auction_matches += 1
-                break
-        
-        if auction_row is not None:
-            # Add auction data
-            for orig_col, new_col in auction_columns.items():
-                jcl_df.at[idx, new_col] = auction_row[orig_col]
-        
-        # Look for matching projection data
-        projection_row = None
-        for variant in name_variants:
-            if variant in projections_map:
-                projection_row = projections_map[variant]
-                projections_matches += 1
-                break
-        
-        if projection_row is not None:
-            # Add projection data
-            for orig_col, new_col in projections_columns.items():
-                jcl_df.at[idx, new_col] = projection_row[orig_col]
+    # Match every JCL row at once, then copy the matched rows' columns in bulk
+    auction_rows = match_rows(jcl_df['Name'], auction_df['Name'])
+    projection_rows = match_rows(jcl_df['Name'], projections_df['Name'])
+    auction_matches = len(auction_rows)
+    projections_matches = len(projection_rows)
+    
+    auction_data = matched_columns(jcl_df.index, auction_df, auction_rows, auction_columns)
+    projection_data = matched_columns(jcl_df.index, projections_df, projection_rows, projections_columns)
+    
+    # A column in both files takes the projection value wherever a projection matched
+    shared_columns = [col for col in projection_data.columns if col in auction_data.columns]
+    projection_matched = jcl_df.index.isin(projection_rows.index)
+    for col in shared_columns:
+        auction_data[col] = auction_data[col].astype(object).where(
+            ~projection_matched, projection_data[col].astype(object)
+        )
+    
+    # Add auction data, then projection data, as typed columns in one step
+    jcl_df = pd.concat([jcl_df, auction_data, projection_data.drop(columns=shared_columns)], axis=1)
     
     print(f'Total JCL records: {len(jcl_df)}')
     print(f'Records matched with auction data: {auction_matches}')
@@ -8,15 +8,13 @@ def test_upload():
     # Path to the sample CSV file
     file_path = os.path.join(os.path.dirname(__file__), 'sample_data.csv')
     
-    # Prepare the files and data for the request
-    files = {'file': open(file_path, 'rb')}
+    # Prepare the data for the request
     data = {'name': 'Test Model', 'description': 'Test model for fantasy baseball data'}
     
-    # Make the request
-    response = requests.post(url, files=files, data=data)
-    
-    # Close the file
-    files['file'].close()
+    # Make the request; the file is closed even if the request fails, and the
+    # session keeps the connection open for any further requests
+    with open(file_path, 'rb') as file, requests.Session() as session:
+        response = session.post(url, files={'file': file}, data=data)
     
     # Print the response
     print(f"Status Code: {response.status_code}")